@@ -0,0 +1,152 @@
+"""
+Animation
+
+History
+18-Oct-2026 - Initial version - animations driven by the time elapsed, taking the same
+              time however long each frame takes to draw
+"""
+import pygame
+
+
+def linear(t):
+    """
+    No easing
+
+    Parameters:
+        t : float
+            fraction of animation time elapsed (0 to 1)
+
+    Returns
+        progress : float
+            fraction of animation movement done (0 to 1)
+    """
+    return t
+
+
+def ease_in_out(t):
+    """
+    Start slowly, speed up and slow down at the end (smoothstep)
+
+    Parameters:
+        t : float
+            fraction of animation time elapsed (0 to 1)
+
+    Returns
+        progress : float
+            fraction of animation movement done (0 to 1)
+    """
+    return t * t * (3 - 2 * t)
+
+
+def ease_out(t):
+    """
+    Start quickly and slow down at the end
+
+    Parameters:
+        t : float
+            fraction of animation time elapsed (0 to 1)
+
+    Returns
+        progress : float
+            fraction of animation movement done (0 to 1)
+    """
+    return 1 - (1 - t) * (1 - t)
+
+
+class Animation:
+    """
+    An animation taking a set time, whatever the speed of the machine.
+
+    Each frame shows the animation as far as it should be at the time the frame is
+    drawn, so if frames are slow to draw, frames are dropped rather than the animation
+    slowing down, and if they are quick the frame rate is capped (using
+    pygame.time.Clock.tick, which waits rather than using the processor).
+
+    Attributes:
+        duration : int
+            time the animation takes in milliseconds
+        easing : function
+            gives the fraction of the movement done from the fraction of time elapsed
+        max_fps : int
+            maximum number of frames per second
+        clock : pygame.time.Clock
+            clock used to time the frames
+    """
+
+    def __init__(self, duration, easing=ease_in_out, max_fps=60, clock=None):
+        """
+        Parameters:
+            duration : int
+                time the animation takes in milliseconds
+
+        Keywords:
+            easing : function
+                gives the fraction of the movement done from the fraction of time
+                elapsed. Default: ease_in_out
+            max_fps : int
+                maximum number of frames per second (0 for no limit). Default: 60
+            clock : pygame.time.Clock
+                clock used to time the frames. Default is None, a new clock
+        """
+        self.duration = duration
+        self.easing = easing
+        self.max_fps = max_fps
+        self.clock = clock if clock is not None else pygame.time.Clock()
+
+    def frames(self):
+        """
+        Generate the progress of the animation for each frame to be drawn,
+        starting at 0 and ending at 1
+
+        Yields
+            progress : float
+                fraction of animation movement done (0 to 1)
+        """
+        start = pygame.time.get_ticks()
+        self.clock.tick()
+        t = 0
+        yield self.easing(0)
+        while t < 1:
+            self.clock.tick(self.max_fps)
+            if self.duration > 0:
+                t = min(1, (pygame.time.get_ticks() - start) / self.duration)
+            else:
+                t = 1
+            yield self.easing(t)
+
+    def steps(self, distance):
+        """
+        Generate the distance moved for each frame to be drawn, starting at 0,
+        ending at distance and skipping any frames which would not move
+
+        Parameters:
+            distance : int
+                total distance (e.g. in pixels or degrees)
+
+        Yields
+            move : int
+                distance moved so far
+        """
+        last_move = None
+        for progress in self.frames():
+            move = round(progress * distance)
+            if move != last_move:
+                last_move = move
+                yield move
+
+
+#
+# Some tests in isolation
+#
+if __name__ == "__main__":
+    print("START TESTING")
+
+    pygame.init()
+    for easing in (linear, ease_in_out, ease_out):
+        animation = Animation(250, easing=easing)
+        start = pygame.time.get_ticks()
+        moves = list(animation.steps(102))
+        print(
+            f"{easing.__name__}: {len(moves)} frames "
+            f"in {pygame.time.get_ticks() - start} ms: {moves}"
+        )
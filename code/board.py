@@ -4,13 +4,34 @@ Board
 History
 17-Jul-2021 - Initial version
 24-Jul-2021 - Position class moved into a separate file
-21-Aug-2021 - Simplified variables and naming - more use of Position and Dimensions, 
+21-Aug-2021 - Simplified variables and naming - more use of Position and Dimensions,
               noted as pos and dim variables
 14-Sep-2021 - Separation of concerns - updated to focus board on key functionality,
               including placements and orientations into a single array to simplify
               passing of information and allow for future extension
+18-Oct-2026 - Door checks use the precomputed door masks of a DoorTable if provided
+18-Oct-2026 - Door masks for the whole board held in a single array, kept up to date
+              as tiles are placed, rotated and slid
+18-Oct-2026 - Listeners can be added to be told the area of the board changed
+18-Oct-2026 - Added ToroidalBoard, storing each row as a circular buffer with an offset
+              so that sliding a row does not move the other tiles in the row
+18-Oct-2026 - Added apply_slides to apply many row and column slides in one call
+18-Oct-2026 - Added compact option holding the tile number and rotation of each square
+              packed into a single small integer (PackedPlacements)
+18-Oct-2026 - Added save and open, holding placements in .npy files that can be
+              memory-mapped, with a header for the tile set
+18-Oct-2026 - get_patch copies the part on the board in one go and draws all new tiles
+              together (without printing)
+18-Oct-2026 - Random rotations drawn from a random number generator given to the board
+18-Oct-2026 - ToroidalBoard placements and door_masks read-only, with door checks
+              reading single squares through get_placement and get_door_mask
+18-Oct-2026 - open writes the door masks next to the placements if they were not
+              saved, so they are only computed once
+18-Oct-2026 - Slides in a direction a row or column cannot move raise ValueError
+18-Oct-2026 - apply_slides draws no more tiles at once than are left in the tile bag
 """
-import random
+import os
+import json
 import numpy as np
 
 from tiles import *
@@ -41,12 +62,39 @@ class Board:
                 ROT = 1 is the rotation or orientation of each tile,
                 0 = no rotation, 1 = 90 degrees rotation anticlockwise
                 2 = 180 degrees rotation, 3 = 90 degrees rotation clockwise
+        door_table : DoorTable
+            precomputed door masks for the tile set in use (None if not provided)
+        door_masks : numpy.array(h, w)
+            door mask (uint8) for each square on the board, with bit d set if there is
+            a door in direction d (0 = up, 1 = left, 2 = down, 3 = right).
+            Only held if the board has a door table (None if not).
+        listeners : list
+            objects to be told of changes to the board. Each must have a method
+            board_changed(rect, edges_changed), which is called with the pygame.Rect
+            of the area of the board changed (in tiles) and whether any doors changed
     """
 
     TILE = 0
     ROT = 1
 
-    def __init__(self, dim, tile_bag=None, tile_list=None):
+    ROWS = 0
+    COLS = 1
+
+    HEADER_FILE = "header.json"
+    PLACEMENTS_FILE = "placements.npy"
+    DOOR_MASKS_FILE = "door_masks.npy"
+
+    def __init__(
+        self,
+        dim,
+        tile_bag=None,
+        tile_list=None,
+        door_table=None,
+        compact=False,
+        placements=None,
+        door_masks=None,
+        rng=None,
+    ):
         """
         Create board of specified size and fill with tiles drawn randomly from the tile bag
         and assigned random orientations.
@@ -59,6 +107,21 @@ class Board:
             tile_bag : TileBag
                 represents the bag of tiles from dimich random ones can be drawn.
                 Default is None, dimich sets empty placement and orientation arrays
+            door_table : DoorTable
+                precomputed door masks used for door checks (e.g. TileSet.door_table).
+                Default is None, in which case doors are looked up from the tiles
+            compact : logical
+                If true hold placements packed into a single small integer for each square
+                (see PackedPlacements). Default: False
+            placements : numpy.array(h, w, n) or PackedPlacements
+                placements to be used as they are (e.g. memory-mapped from a file),
+                instead of drawing tiles. Default is None
+            door_masks : numpy.array(h, w)
+                door masks to be used as they are with the placements given.
+                Default is None, in which case they are calculated from the placements
+            rng : numpy.random.Generator
+                random number generator for the rotations of new tiles
+                (e.g. RandomStreams.get("board")). Default is None, a new generator
         """
         self.dim = dim
         self.w = self.dim.w
@@ -66,12 +129,22 @@ class Board:
         self.size = self.w * self.h
         self.n = 2
         self.rect = pygame.Rect(0, 0, self.w, self.h)
+        self.door_table = door_table
+        self.listeners = []
+        self.rng = rng if rng is not None else np.random.default_rng()
 
-        self.placements = np.empty([self.h, self.w, self.n], dtype=int)
+        if placements is not None:
+            self.placements = placements
+            if door_masks is None and self.door_table is not None:
+                door_masks = self.door_table.masks[
+                    placements[..., Board.TILE], placements[..., Board.ROT]
+                ]
+            self.door_masks = door_masks
+            return
 
-        if tile_bag:
+        if tile_bag is not None:
             tiles = np.array(tile_bag.draw_tiles(self.size), dtype=int)
-            rots = np.array(random.choices(Position.DIRECTIONS, k=self.size), dtype=int)
+            rots = self.rng.integers(4, size=self.size)
             tiles.shape = (self.h, self.w)
             rots.shape = (self.h, self.w)
         elif tile_list:
@@ -79,8 +152,328 @@ class Board:
             tiles.shape = (self.h, self.w)
             rots = np.zeros((self.h, self.w), dtype=int)
 
-        self.placements[:, :, Board.TILE] = tiles
-        self.placements[:, :, Board.ROT] = rots
+        if compact:
+            if door_table is not None:
+                tile_count = len(door_table.masks)
+            else:
+                tile_count = tiles.max() + 1
+            self.placements = PackedPlacements(tiles, rots, tile_count)
+        else:
+            placements = np.empty([self.h, self.w, self.n], dtype=int)
+            placements[:, :, Board.TILE] = tiles
+            placements[:, :, Board.ROT] = rots
+            self.placements = placements
+
+        if self.door_table is not None:
+            self.door_masks = self.door_table.masks[tiles, rots]
+        else:
+            self.door_masks = None
+
+    def save(self, path, tile_set=None):
+        """
+        Save the board to a directory: the placements (and door masks, if held)
+        as .npy files, which can be memory-mapped when opened,
+        and a header with the board details and the tile set
+
+        Parameters:
+            path : str
+                directory to save the board in (created if required)
+
+        Keywords:
+            tile_set : TileSet
+                set of tiles in use, saved in the header. Default is None, not saved
+        """
+        os.makedirs(path, exist_ok=True)
+        compact = isinstance(self.placements, PackedPlacements)
+        if compact:
+            np.save(os.path.join(path, Board.PLACEMENTS_FILE), self.placements.packed)
+        else:
+            np.save(os.path.join(path, Board.PLACEMENTS_FILE), self.placements)
+        if self.door_masks is not None:
+            np.save(os.path.join(path, Board.DOOR_MASKS_FILE), self.door_masks)
+
+        header = {
+            "w": self.w,
+            "h": self.h,
+            "compact": compact,
+            "tile_set": tile_set.get_definition() if tile_set is not None else None,
+        }
+        with open(os.path.join(path, Board.HEADER_FILE), "w") as header_file:
+            json.dump(header, header_file, indent=4)
+
+    @classmethod
+    def open(cls, path, mmap=True, door_table=None, rng=None):
+        """
+        Open a board saved with save. If memory-mapped, opening takes the same time
+        whatever the size of the board, only the areas of the board used are read
+        and changes to the board are written back to the files.
+
+        If there is a door table but the board was saved without door masks,
+        the door masks are computed and written next to the placements first
+        (see write_door_masks). This reads the whole board once, taking time in
+        proportion to its size (O(w * h)), but later opens are quick again.
+
+        Parameters:
+            path : str
+                directory the board was saved in
+
+        Keywords:
+            mmap : logical
+                If true memory-map the files, otherwise read them into memory.
+                Default: True
+            door_table : DoorTable
+                precomputed door masks used for door checks.
+                Default is None, in which case the door table of the tile set saved
+                in the header is used (if any)
+
+        Returns
+            board : Board
+                board opened
+        """
+        header = cls.read_header(path)
+        if door_table is None and header["tile_set"] is not None:
+            door_table = TileSet.from_definition(header["tile_set"]).door_table
+
+        mmap_mode = "r+" if mmap else None
+        placements = np.load(os.path.join(path, Board.PLACEMENTS_FILE), mmap_mode)
+        if header["compact"]:
+            placements = PackedPlacements(None, None, packed=placements)
+        door_masks = None
+        door_masks_path = os.path.join(path, Board.DOOR_MASKS_FILE)
+        if door_table is not None:
+            if not os.path.exists(door_masks_path):
+                cls.write_door_masks(door_masks_path, placements, door_table)
+            door_masks = np.load(door_masks_path, mmap_mode)
+
+        return cls(
+            Dimensions(header["w"], header["h"]),
+            door_table=door_table,
+            placements=placements,
+            door_masks=door_masks,
+            rng=rng,
+        )
+
+    @staticmethod
+    def write_door_masks(door_masks_path, placements, door_table):
+        """
+        Compute the door masks for placements and write them to a .npy file.
+        The file is written through a memory map a block of rows at a time,
+        so only a block of the board is held in memory (the time taken is still
+        in proportion to the size of the board).
+
+        Parameters:
+            door_masks_path : str
+                path of .npy file to write
+            placements : numpy.array(h, w, n) or PackedPlacements
+                tile number and rotation of each square
+            door_table : DoorTable
+                precomputed door masks for the tile set in use
+        """
+        h, w = placements.shape[:2]
+        door_masks = np.lib.format.open_memmap(
+            door_masks_path, mode="w+", dtype=door_table.masks.dtype, shape=(h, w)
+        )
+        rows = max(1, 2**20 // max(w, 1))
+        for top in range(0, h, rows):
+            block = placements[top : top + rows]
+            door_masks[top : top + rows] = door_table.masks[
+                block[..., Board.TILE], block[..., Board.ROT]
+            ]
+        door_masks.flush()
+        del door_masks
+
+    @staticmethod
+    def read_header(path):
+        """
+        Read the header of a board saved with save
+
+        Parameters:
+            path : str
+                directory the board was saved in
+
+        Returns
+            header : dict
+                w and h dimensions of board, whether compact,
+                and tile set definition (None if not saved)
+        """
+        with open(os.path.join(path, Board.HEADER_FILE)) as header_file:
+            return json.load(header_file)
+
+    @staticmethod
+    def open_tile_set(path):
+        """
+        Create the tile set saved with a board
+
+        Parameters:
+            path : str
+                directory the board was saved in
+
+        Returns
+            tile_set : TileSet
+                tile set saved in the header (None if not saved)
+        """
+        definition = Board.read_header(path)["tile_set"]
+        if definition is None:
+            return None
+        return TileSet.from_definition(definition)
+
+    def get_placement(self, pos):
+        """
+        Get the tile number and rotation at a position on the board
+
+        Parameters:
+            pos : Position
+                x, y coordinates of tile placement. (0, 0) = (left, top)
+
+        Returns
+            tile : int
+                number of tile
+            rot : int
+                rotation of tile
+        """
+        return (
+            self.placements[pos.y, pos.x, Board.TILE],
+            self.placements[pos.y, pos.x, Board.ROT],
+        )
+
+    def get_region(self, rect):
+        """
+        Get the placements for an area of the board (which must be on the board)
+
+        Parameters:
+            rect : pygame.Rect
+                area of board (in tiles)
+
+        Returns
+            region_placements : numpy.array(h, w, n)
+                holds all information on the state of the each square in the area
+        """
+        return self.placements[rect.top : rect.bottom, rect.left : rect.right, :].copy()
+
+    def get_door_masks(self, rect=None):
+        """
+        Get the door masks for all or part of the board.
+        Requires the board to have a door table.
+
+        Keywords:
+            rect : pygame.Rect
+                area of board (in tiles). Default is None, the whole board
+
+        Returns
+            door_masks : numpy.array(h, w)
+                door mask for each square in the area
+        """
+        if rect is None:
+            return self.door_masks
+        return self.door_masks[rect.top : rect.bottom, rect.left : rect.right]
+
+    def get_door_mask(self, pos):
+        """
+        Get the door mask of one square of the board.
+        Requires the board to have a door table.
+
+        Parameters:
+            pos : Position
+                x, y coordinates of square. (0, 0) = (left, top)
+
+        Returns
+            door_mask : int
+                door mask of the square
+        """
+        return self.door_masks[pos.y, pos.x]
+
+    def update_door_masks(self, rect=None):
+        """
+        Recalculate door masks from the placements for all or part of the board.
+        Does nothing if the board has no door table.
+
+        Keywords:
+            rect : pygame.Rect
+                area of board (in tiles) to be updated. Default is None, the whole board
+
+        Returns
+            edges_changed : logical
+                True if any door mask has changed (always True if no door table)
+        """
+        if self.door_masks is None:
+            return True
+        if rect is None:
+            rect = self.rect
+        area = (slice(rect.top, rect.bottom), slice(rect.left, rect.right))
+        masks = self.door_table.masks[
+            self.placements[area + (Board.TILE,)],
+            self.placements[area + (Board.ROT,)],
+        ]
+        edges_changed = not np.array_equal(masks, self.door_masks[area])
+        self.door_masks[area] = masks
+        return edges_changed
+
+    def add_listener(self, listener):
+        """
+        Add a listener to be told of changes to the board
+
+        Parameters:
+            listener : object
+                object with a method board_changed(rect, edges_changed)
+        """
+        self.listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """
+        Remove a listener previously added
+
+        Parameters:
+            listener : object
+                listener to be removed
+        """
+        self.listeners.remove(listener)
+
+    def changed(self, rect):
+        """
+        Update door masks for an area of the board that has changed and tell listeners
+
+        Parameters:
+            rect : pygame.Rect
+                area of board (in tiles) that has changed
+        """
+        edges_changed = self.update_door_masks(rect)
+        for listener in self.listeners:
+            listener.board_changed(rect, edges_changed)
+
+    def get_doors(self):
+        """
+        Get whether there is a door on each edge of each square on the board.
+        Requires the board to have a door table.
+
+        Returns
+            doors : numpy.array(h, w, 4)
+                True if door is present for each square and direction
+                (0 = up, 1 = left, 2 = down, 3 = right)
+        """
+        bits = np.arange(4, dtype=np.uint8)
+        return ((self.door_masks[..., np.newaxis] >> bits) & 1).astype(bool)
+
+    def get_passages(self):
+        """
+        Get whether movement is possible from each square on the board to the
+        adjacent square in each direction, i.e. the adjacent square is on the board
+        and there are doors on both sides.
+        Requires the board to have a door table.
+
+        Returns
+            passages : numpy.array(h, w, 4)
+                True if movement is possible for each square and direction
+                (0 = up, 1 = left, 2 = down, 3 = right)
+        """
+        doors = self.get_doors()
+        passages = np.zeros([self.h, self.w, 4], dtype=bool)
+        vertical = doors[1:, :, Position.UP] & doors[:-1, :, Position.DOWN]
+        horizontal = doors[:, 1:, Position.LEFT] & doors[:, :-1, Position.RIGHT]
+        passages[1:, :, Position.UP] = vertical
+        passages[:-1, :, Position.DOWN] = vertical
+        passages[:, 1:, Position.LEFT] = horizontal
+        passages[:, :-1, Position.RIGHT] = horizontal
+        return passages
 
     def place_tile(self, pos, tile, rot=0):
         """
@@ -97,6 +490,7 @@ class Board:
         """
         self.placements[pos.y, pos.x, Board.TILE] = tile
         self.placements[pos.y, pos.x, Board.ROT] = rot
+        self.changed(pygame.Rect(pos.x, pos.y, 1, 1))
 
     def rotate_tile(self, pos, rotate):
         """
@@ -110,6 +504,7 @@ class Board:
         """
         rot = self.placements[pos.y, pos.x, Board.ROT]
         self.placements[pos.y, pos.x, Board.ROT] = (rot + rotate) % 4
+        self.changed(pygame.Rect(pos.x, pos.y, 1, 1))
 
     def check_for_door(self, pos, dir, tiles, next=False):
         """
@@ -122,7 +517,7 @@ class Board:
                 Direction in which presence of door to be checked.
                 0 = up, 1 = left, 2 = down, 3 = right
             tiles : TileSet.tiles
-                Tiles in use
+                Tiles in use (not used if the board has a door table)
 
         Keywords:
             next : logical
@@ -132,19 +527,54 @@ class Board:
             door : logical
                 True if door is present, False if not
         """
+        if self.door_table is not None:
+            x = pos.x
+            y = pos.y
+            if next:
+                step_x, step_y = Position.STEPS[dir]
+                x += step_x
+                y += step_y
+                dir = (dir + 2) % 4
+            return (self.get_door_mask(Position(x, y)) >> dir) & 1
+
         if next:
             pos_to_check = pos.get_next(dir)
             dir_to_check = (dir + 2) % 4
         else:
             pos_to_check = pos
             dir_to_check = dir
-        tile = self.placements[pos_to_check.y, pos_to_check.x, Board.TILE]
-        rot = self.placements[pos_to_check.y, pos_to_check.x, Board.ROT]
+        tile, rot = self.get_placement(pos_to_check)
         doors = tiles[tile].doors
         door_index = (dir_to_check - rot) % 4
         return doors[door_index]
 
-    def slide_row(self, row, dir, tile_bag):
+    def can_move(self, pos, dir):
+        """
+        Check if movement is possible from a tile to the next tile in a particular direction,
+        i.e. the next tile is on the board and there are doors on both sides.
+        Requires the board to have a door table.
+
+        Parameters:
+            pos : Position
+                x, y coordinates of tile placement. (0, 0) = (left, top)
+            dir : int
+                Direction of movement.
+                0 = up, 1 = left, 2 = down, 3 = right
+
+        Returns
+            passable : logical
+                True if movement is possible, False if not
+        """
+        step_x, step_y = Position.STEPS[dir]
+        next_x = pos.x + step_x
+        next_y = pos.y + step_y
+        if not (0 <= next_x < self.w and 0 <= next_y < self.h):
+            return False
+        mask = self.get_door_mask(pos)
+        next_mask = self.get_door_mask(Position(next_x, next_y))
+        return bool(self.door_table.passable[mask, next_mask, dir])
+
+    def slide_row(self, row, dir, tile_bag, return_patch=True):
         """
         Slide column nup or down 1 tile
 
@@ -157,26 +587,35 @@ class Board:
             tile_bag : TileBag
                 bag of tiles from which random ones can be drawn
 
+        Keywords:
+            return_patch : logical
+                If true return the patch. Default: True
+
         Returns
             patch_placements : numpy.array(h, w, n)
                 holds all information on the state of the each square on the board.in the 'patch'
+                (None if return_patch is False)
         """
         patch_placements = np.empty([1, self.w + 1, self.n], dtype=int)
         if dir == Position.LEFT:
             patch_placements[0, : self.w, :] = self.placements[row, ...]
             patch_placements[0, self.w, Board.TILE] = tile_bag.draw_tile()
-            patch_placements[0, self.w, Board.ROT] = random.choice(Position.DIRECTIONS)
+            patch_placements[0, self.w, Board.ROT] = int(self.rng.integers(4))
             self.placements[row, ...] = patch_placements[0, 1:, :]
             tile_bag.return_tile(patch_placements[0, 0, Board.TILE])
         elif dir == Position.RIGHT:
             patch_placements[0, 1:, :] = self.placements[row, ...]
             patch_placements[0, 0, Board.TILE] = tile_bag.draw_tile()
-            patch_placements[0, 0, Board.ROT] = random.choice(Position.DIRECTIONS)
+            patch_placements[0, 0, Board.ROT] = int(self.rng.integers(4))
             self.placements[row, ...] = patch_placements[0, : self.w, :]
             tile_bag.return_tile(patch_placements[0, self.w, Board.TILE])
-        return patch_placements
+        else:
+            raise ValueError(f"row can only slide left (1) or right (3), not {dir}")
+        self.changed(pygame.Rect(0, row, self.w, 1))
+        if return_patch:
+            return patch_placements
 
-    def slide_col(self, col, dir, tile_bag):
+    def slide_col(self, col, dir, tile_bag, return_patch=True):
         """
         Slide column nup or down 1 tile
 
@@ -189,24 +628,241 @@ class Board:
             tile_bag : TileBag
                 bag of tiles from which random ones can be drawn
 
+        Keywords:
+            return_patch : logical
+                If true return the patch. Default: True
+
         Returns
             patch_placements : numpy.array(h, w, n)
                 holds all information on the state of the each square on the board.in the 'patch'
+                (None if return_patch is False)
         """
         patch_placements = np.empty([self.h + 1, 1, self.n], dtype=int)
         if dir == Position.UP:
             patch_placements[: self.h, 0, :] = self.placements[:, col, :]
             patch_placements[self.h, 0, Board.TILE] = tile_bag.draw_tile()
-            patch_placements[self.h, 0, Board.ROT] = random.choice(Position.DIRECTIONS)
+            patch_placements[self.h, 0, Board.ROT] = int(self.rng.integers(4))
             self.placements[:, col, :] = patch_placements[1:, 0, :]
             tile_bag.return_tile(patch_placements[0, 0, Board.TILE])
         elif dir == Position.DOWN:
             patch_placements[1:, 0, :] = self.placements[:, col, :]
             patch_placements[0, 0, Board.TILE] = tile_bag.draw_tile()
-            patch_placements[0, 0, Board.ROT] = random.choice(Position.DIRECTIONS)
+            patch_placements[0, 0, Board.ROT] = int(self.rng.integers(4))
             self.placements[:, col, :] = patch_placements[: self.h, 0, :]
             tile_bag.return_tile(patch_placements[self.h, 0, Board.TILE])
-        return patch_placements
+        else:
+            raise ValueError(f"column can only slide up (0) or down (2), not {dir}")
+        self.changed(pygame.Rect(col, 0, 1, self.h))
+        if return_patch:
+            return patch_placements
+
+    def get_slide_patches(self, old_lines, forward, new_placements):
+        """
+        Get the patches for lines (rows or columns) slid a number of times
+        in the same direction. The patch is the line before sliding
+        with the new tiles added at the end the tiles were slid from.
+
+        Parameters:
+            old_lines : numpy.array(m, l, n)
+                placements of each line before sliding
+            forward : logical
+                True if slid towards the start of the line (left or up)
+            new_placements : numpy.array(m, k, n)
+                placements of the new tiles for each line, in the order drawn
+
+        Returns
+            patch_lines : numpy.array(m, l + k, n)
+                placements in the patch for each line
+        """
+        if forward:
+            return np.concatenate([old_lines, new_placements], axis=1)
+        else:
+            return np.concatenate([new_placements[:, ::-1], old_lines], axis=1)
+
+    def get_slide_groups(self, slides):
+        """
+        Group slides of the same type (rows or columns) by the line slid
+
+        Parameters:
+            slides : numpy.array(k, 3)
+                slides, each (axis, index, dir), all with the same axis
+
+        Returns
+            lines : numpy.array(m)
+                (full) board coordinate of each row or column slid
+            line_slides : list
+                indices into slides for each line, in order
+            line_dirs : list
+                direction of the slides for each line (None if both directions)
+        """
+        lines, inverse = np.unique(slides[:, 1], return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        line_slides = np.split(order, np.cumsum(np.bincount(inverse))[:-1])
+        line_dirs = []
+        for indices in line_slides:
+            dirs = slides[indices, 2]
+            line_dirs.append(dirs[0] if (dirs == dirs[0]).all() else None)
+        return lines, line_slides, line_dirs
+
+    def apply_slides(self, slides, tile_bag, return_patches=True):
+        """
+        Apply a number of row and column slides in one call.
+        The new tiles are drawn from the tile bag together and the tiles slid off
+        the board are returned to it together after the slides
+        (so a tile slid off cannot be drawn again by a later slide in the same batch).
+        If there are fewer tiles left in the bag than slides, the slides are applied
+        in batches of at most the number of tiles left, returning the tiles slid off
+        after each batch, so any bag that could serve the slides one at a time will do.
+        Slides of rows (or columns) next to each other in a batch are applied together,
+        with all the rows (or columns) slid the same number of times in the same direction
+        moved by a single array assignment. A row (or column) slid in both directions
+        in the same group is slid one tile at a time, and has no patch.
+
+        Parameters:
+            slides : numpy.array(k, 3) or list
+                slides in the order to be applied, each (axis, index, dir):
+                axis is Board.ROWS or Board.COLS,
+                index is the (full) board coordinate of the row or column and
+                dir is the direction (1 = left, 3 = right for rows, 0 = up, 2 = down for columns)
+            tile_bag : TileBag
+                bag of tiles from which random ones can be drawn
+
+        Keywords:
+            return_patches : logical
+                If true return the patches. Default: True
+
+        Returns
+            displaced_placements : numpy.array(m, n)
+                placements of the tiles slid off the board
+            patches : list
+                (axis, index, dir, patch_placements) for each row or column in each
+                group of slides (in each batch), where patch_placements is the line
+                before sliding with the new tiles added as for slide_row and slide_col.
+                dir and patch_placements are None for a line slid in both directions.
+                (None if return_patches is False)
+        """
+        slides = np.asarray(slides, dtype=int).reshape(-1, 3)
+        displaced = [np.empty([0, self.n], dtype=int)]
+        patches = []
+        start = 0
+        while start < len(slides):
+            end = len(slides)
+            if hasattr(tile_bag, "__len__"):  # a TileSource is never empty
+                end = min(end, start + max(len(tile_bag), 1))
+            displaced.append(
+                self.apply_slide_batch(
+                    slides[start:end], tile_bag, patches if return_patches else None
+                )
+            )
+            start = end
+
+        displaced_placements = np.concatenate(displaced)
+        if return_patches:
+            return displaced_placements, patches
+        return displaced_placements, None
+
+    def apply_slide_batch(self, slides, tile_bag, patches):
+        """
+        Apply a batch of slides (used by apply_slides), drawing all the new tiles
+        from the tile bag first and returning all the tiles slid off at the end
+
+        Parameters:
+            slides : numpy.array(k, 3)
+                slides, each (axis, index, dir)
+            tile_bag : TileBag
+                bag of tiles from which random ones can be drawn
+            patches : list
+                list to which patches are added (None if not required)
+
+        Returns
+            displaced_placements : numpy.array(m, n)
+                placements of the tiles slid off the board
+        """
+        new_placements = np.empty([len(slides), self.n], dtype=int)
+        new_placements[:, Board.TILE] = tile_bag.draw_tiles(len(slides))
+        new_placements[:, Board.ROT] = self.rng.integers(4, size=len(slides))
+
+        displaced = [np.empty([0, self.n], dtype=int)]
+        group_starts = np.flatnonzero(np.diff(slides[:, 0], prepend=-1))
+        group_ends = np.append(group_starts[1:], len(slides))
+        for start, end in zip(group_starts, group_ends):
+            self.slide_lines(
+                slides[start:end], new_placements[start:end], displaced, patches
+            )
+
+        displaced_placements = np.concatenate(displaced)
+        tile_bag.return_tiles(displaced_placements[:, Board.TILE])
+        return displaced_placements
+
+    def slide_lines(self, slides, new_placements, displaced, patches):
+        """
+        Apply a group of slides all of rows or all of columns (used by apply_slides)
+
+        Parameters:
+            slides : numpy.array(k, 3)
+                slides, each (axis, index, dir), all with the same axis
+            new_placements : numpy.array(k, n)
+                placements of the new tile for each slide
+            displaced : list
+                list to which placements of tiles slid off the board are added
+            patches : list
+                list to which patches are added (None if not required)
+        """
+        axis = slides[0, 0]
+        if axis == Board.ROWS:
+            placements = self.placements
+            forward_dir = Position.LEFT
+        else:
+            placements = self.placements.transpose(1, 0, 2)
+            forward_dir = Position.UP
+        length = placements.shape[1]
+        lines, line_slides, line_dirs = self.get_slide_groups(slides)
+
+        # lines slid in one direction, grouped by the number of slides
+        counts = np.array([len(indices) for indices in line_slides])
+        for dir in (forward_dir, (forward_dir + 2) % 4):
+            same_dir = np.array([line_dir == dir for line_dir in line_dirs])
+            for count in np.unique(counts[same_dir]):
+                group = np.flatnonzero(same_dir & (counts == count))
+                group_new = new_placements[np.array([line_slides[g] for g in group])]
+                patch_lines = self.get_slide_patches(
+                    placements[lines[group]], dir == forward_dir, group_new
+                )
+                if dir == forward_dir:
+                    placements[lines[group]] = patch_lines[:, count:]
+                    displaced.append(patch_lines[:, :count].reshape(-1, self.n))
+                else:
+                    placements[lines[group]] = patch_lines[:, :length]
+                    displaced.append(patch_lines[:, length:].reshape(-1, self.n))
+                if patches is not None:
+                    for line, patch_line in zip(lines[group], patch_lines):
+                        if axis == Board.ROWS:
+                            patch_line = patch_line[np.newaxis, :, :]
+                        else:
+                            patch_line = patch_line[:, np.newaxis, :]
+                        patches.append((axis, line, dir, patch_line))
+
+        # lines slid in both directions, slid one at a time
+        for line, indices, line_dir in zip(lines, line_slides, line_dirs):
+            if line_dir is not None:
+                continue
+            cells = list(placements[line].copy())
+            for dir, new_placement in zip(slides[indices, 2], new_placements[indices]):
+                if dir == forward_dir:
+                    displaced.append(cells.pop(0)[np.newaxis, :])
+                    cells.append(new_placement)
+                else:
+                    displaced.append(cells.pop()[np.newaxis, :])
+                    cells.insert(0, new_placement)
+            placements[line] = np.array(cells)
+            if patches is not None:
+                patches.append((axis, line, None, None))
+
+        for line in lines:
+            if axis == Board.ROWS:
+                self.changed(pygame.Rect(0, line, self.w, 1))
+            else:
+                self.changed(pygame.Rect(line, 0, 1, self.h))
 
     def __str__(self):
         """Print board details"""
@@ -215,12 +871,13 @@ class Board:
         header1 = "Tiles" + " " * max(0, (self.w - len("Tiles")))
         header2 = "Rotations" + " " * max(0, (self.w - len("Rotations")))
         string += header1 + " " + header2 + "\n"
+        placements = self.placements
         for y in range(self.h):
             tiles_row = ""
             rots_row = ""
             for x in range(self.w):
-                tiles_row += str(self.placements[y, x, Board.TILE])
-                rots_row += str(self.placements[y, x, Board.ROT])
+                tiles_row += str(placements[y, x, Board.TILE])
+                rots_row += str(placements[y, x, Board.ROT])
             string += f"{tiles_row} {rots_row}\n"
         return string
 
@@ -240,36 +897,624 @@ class Board:
         """
         patch_placements = np.empty([patch_rect.h, patch_rect.w, self.n], dtype=int)
 
-        for y in range(patch_rect.top, patch_rect.bottom):
-            patch_y = y - patch_rect.top
-            print(f"y: {y}  patch_y: {patch_y}")
-            for x in range(patch_rect.left, patch_rect.right):
-                patch_x = x - patch_rect.left
-                print(f"  x: {x}  patch_x:  {patch_x}")
-                if self.rect.collidepoint(x, y):
-                    patch_placements[patch_y, patch_x, :] = self.placements[y, x, :]
-                    print(
-                        f"    Inside: tile = {patch_placements[patch_y, patch_x, Board.TILE]}    rot = {patch_placements[patch_y, patch_x, Board.ROT]}"
-                    )
-                    print(
-                        f"            tile = {self.placements[y, x, Board.TILE]}    rot = {self.placements[y, x, Board.ROT]}"
-                    )
-                else:
-                    patch_placements[
-                        patch_y, :patch_x, Board.TILE
-                    ] = tile_bag.draw_tile()
-                    patch_placements[patch_y, patch_x, Board.ROT] = random.choice(
-                        Position.DIRECTIONS
-                    )
-                    print(
-                        f"    Outside: tile = {patch_placements[patch_y, patch_x, Board.TILE]}    rot = {patch_placements[patch_y, patch_x, Board.ROT]}"
-                    )
-                    print(
-                        f"             tile = {self.placements[y, x, Board.TILE]}    rot = {self.placements[y, x, Board.ROT]}"
-                    )
+        # Copy the part of the patch on the board
+        inside_rect = patch_rect.clip(self.rect)
+        inside = np.zeros([patch_rect.h, patch_rect.w], dtype=bool)
+        if inside_rect.w and inside_rect.h:
+            top = inside_rect.top - patch_rect.top
+            left = inside_rect.left - patch_rect.left
+            inside_slice = (
+                slice(top, top + inside_rect.h),
+                slice(left, left + inside_rect.w),
+            )
+            patch_placements[inside_slice] = self.get_region(inside_rect)
+            inside[inside_slice] = True
+
+        # Fill the rest with new tiles
+        outside_count = patch_rect.w * patch_rect.h - inside_rect.w * inside_rect.h
+        if outside_count:
+            outside = ~inside
+            patch_placements[outside, Board.TILE] = tile_bag.draw_tiles(outside_count)
+            patch_placements[outside, Board.ROT] = self.rng.integers(
+                4, size=outside_count
+            )
         return patch_placements
 
 
+class PackedPlacements:
+    """
+    Placements for a board with the tile number and rotation of each square packed
+    into a single small integer: tile * 4 + rot. This is a uint8 for up to 64 different
+    tiles (otherwise a uint16), rather than two 8 byte integers.
+
+    Indexing works as for a numpy.array(h, w, n) of placements, using Board.TILE
+    and Board.ROT for the last index, returning numpy arrays of ints,
+    so that existing code using placements works unchanged.
+
+    Attributes:
+        packed : numpy.array(h, w)
+            packed tile number and rotation of each square
+        shape : tuple
+            (h, w, n) shape of the placements
+    """
+
+    ROT_BITS = 2
+    ROT_MASK = 3
+
+    def __init__(self, tiles, rots, tile_count=64, packed=None):
+        """
+        Parameters:
+            tiles : numpy.array(h, w)
+                tile number of each square
+            rots : numpy.array(h, w)
+                rotation of each square
+
+        Keywords:
+            tile_count : int
+                number of different tiles, which sets the size of integer used.
+                Default: 64
+            packed : numpy.array(h, w)
+                already packed placements to be used (instead of tiles and rots)
+        """
+        if packed is None:
+            dtype = np.uint8 if tile_count <= 64 else np.uint16
+            packed = (np.asarray(tiles) << self.ROT_BITS | np.asarray(rots)).astype(
+                dtype
+            )
+        self.packed = packed
+        self.shape = packed.shape + (2,)
+        self.ndim = 3
+
+    def split_key(self, key):
+        """
+        Split an index for the placements into the index for the squares
+        and the index for the attribute (Board.TILE, Board.ROT)
+
+        Parameters:
+            key : index
+                index for numpy.array(h, w, n)
+
+        Returns
+            square_key : tuple
+                index for the packed squares
+            attribute_key : int or slice
+                index for the attribute
+        """
+        if not isinstance(key, tuple):
+            key = (key,)
+        if any(part is Ellipsis for part in key):
+            at = [part is Ellipsis for part in key].index(True)
+            fill = (slice(None),) * (3 - len(key) + 1)
+            key = key[:at] + fill + key[at + 1 :]
+        key = key + (slice(None),) * (3 - len(key))
+        attribute_key = key[2]
+        if isinstance(attribute_key, np.integer):
+            attribute_key = int(attribute_key)
+        return key[:2], attribute_key
+
+    def unpack(self, packed):
+        """
+        Unpack placements
+
+        Parameters:
+            packed : numpy.array
+                packed placements
+
+        Returns
+            placements : numpy.array(..., n)
+                tile number and rotation for each packed placement
+        """
+        packed = np.asarray(packed, dtype=int)
+        return np.stack([packed >> self.ROT_BITS, packed & self.ROT_MASK], axis=-1)
+
+    def __getitem__(self, key):
+        """Get placements as for numpy.array(h, w, n)"""
+        square_key, attribute_key = self.split_key(key)
+        packed = self.packed[square_key]
+        if isinstance(attribute_key, slice):
+            return self.unpack(packed)[..., attribute_key]
+        elif attribute_key == Board.TILE:
+            return np.asarray(packed, dtype=int) >> self.ROT_BITS
+        elif attribute_key == Board.ROT:
+            return np.asarray(packed, dtype=int) & self.ROT_MASK
+
+    def __setitem__(self, key, value):
+        """Set placements as for numpy.array(h, w, n)"""
+        square_key, attribute_key = self.split_key(key)
+        value = np.asarray(value, dtype=int)
+        if isinstance(attribute_key, slice):
+            self.packed[square_key] = (
+                value[..., Board.TILE] << self.ROT_BITS | value[..., Board.ROT]
+            )
+        elif attribute_key == Board.TILE:
+            rots = self.packed[square_key] & self.ROT_MASK
+            self.packed[square_key] = value << self.ROT_BITS | rots
+        elif attribute_key == Board.ROT:
+            tiles = self.packed[square_key] & ~self.packed.dtype.type(self.ROT_MASK)
+            self.packed[square_key] = tiles | value
+
+    def transpose(self, *axes):
+        """
+        Swap the x and y axes (as numpy.array.transpose(1, 0, 2)),
+        giving placements sharing the same packed array
+        """
+        return PackedPlacements(None, None, packed=self.packed.T)
+
+    def copy(self):
+        """Copy of placements"""
+        return PackedPlacements(None, None, packed=self.packed.copy())
+
+    def __array__(self, dtype=None, copy=None):
+        """Unpacked placements as numpy.array(h, w, n)"""
+        placements = self.unpack(self.packed)
+        if dtype is not None:
+            placements = placements.astype(dtype)
+        return placements
+
+    def __len__(self):
+        """Length of first axis"""
+        return self.shape[0]
+
+
+class ToroidalBoard(Board):
+    """
+    Board storing each row as a circular buffer with an offset, so that sliding a row
+    only replaces the tile leaving the row and changes the offset,
+    rather than moving every tile in the row. Sliding a column moves one tile in each row.
+    The cost of a slide therefore does not depend on the width of the board.
+
+    All reads and writes go through the row offsets. The placements and door_masks
+    attributes give read-only copies of the whole board in the normal layout, costing
+    a copy of the whole board (O(w * h)) on every use. Writing to them raises
+    ValueError rather than changing a copy, so use place_tile or rotate_tile to
+    change the board, and get_placement, get_region, get_door_mask and
+    get_door_masks to read it.
+
+    Attributes:
+        cells : numpy.array(h, w, n)
+            placements for each square, with each row held as a circular buffer
+        cell_masks : numpy.array(h, w)
+            door masks for each square, held in the same way as cells
+            (None if the board has no door table)
+        row_offsets : numpy.array(h)
+            position in cells of the first (left hand) square of each row
+    """
+
+    @property
+    def placements(self):
+        """Placements for the whole board (a read-only copy of the whole board)"""
+        placements = self.cells[
+            self.all_rows, self.get_cell_x(self.all_rows, self.all_cols)
+        ]
+        placements.flags.writeable = False
+        return placements
+
+    @placements.setter
+    def placements(self, placements):
+        self.cells = placements
+        self.all_rows = np.arange(self.h)[:, np.newaxis]
+        self.all_cols = np.arange(self.w)[np.newaxis, :]
+        self.row_offsets = np.zeros(self.h, dtype=int)
+
+    @property
+    def door_masks(self):
+        """Door masks for the whole board (a read-only copy of the whole board)"""
+        if self.cell_masks is None:
+            return None
+        door_masks = self.cell_masks[
+            self.all_rows, self.get_cell_x(self.all_rows, self.all_cols)
+        ]
+        door_masks.flags.writeable = False
+        return door_masks
+
+    @door_masks.setter
+    def door_masks(self, door_masks):
+        self.cell_masks = door_masks
+
+    def get_cell_x(self, y, x):
+        """
+        Get the position in cells of a square on the board (works on arrays)
+
+        Parameters:
+            y : int or numpy.array
+                board y (tile) coordinate
+            x : int or numpy.array
+                board x (tile) coordinate
+
+        Returns
+            cell_x : int or numpy.array
+                x coordinate in cells
+        """
+        return (x + self.row_offsets[y]) % self.w
+
+    def get_placement(self, pos):
+        """
+        Get the tile number and rotation at a position on the board
+
+        Parameters:
+            pos : Position
+                x, y coordinates of tile placement. (0, 0) = (left, top)
+
+        Returns
+            tile : int
+                number of tile
+            rot : int
+                rotation of tile
+        """
+        cell_x = self.get_cell_x(pos.y, pos.x)
+        return (
+            self.cells[pos.y, cell_x, Board.TILE],
+            self.cells[pos.y, cell_x, Board.ROT],
+        )
+
+    def get_region(self, rect):
+        """
+        Get the placements for an area of the board (which must be on the board)
+
+        Parameters:
+            rect : pygame.Rect
+                area of board (in tiles)
+
+        Returns
+            region_placements : numpy.array(h, w, n)
+                holds all information on the state of the each square in the area
+        """
+        rows = np.arange(rect.top, rect.bottom)[:, np.newaxis]
+        cols = np.arange(rect.left, rect.right)[np.newaxis, :]
+        return self.cells[rows, self.get_cell_x(rows, cols)]
+
+    def get_door_masks(self, rect=None):
+        """
+        Get the door masks for all or part of the board.
+        Requires the board to have a door table.
+
+        Keywords:
+            rect : pygame.Rect
+                area of board (in tiles). Default is None, the whole board
+
+        Returns
+            door_masks : numpy.array(h, w)
+                door mask for each square in the area
+        """
+        if rect is None:
+            return self.door_masks
+        rows = np.arange(rect.top, rect.bottom)[:, np.newaxis]
+        cols = np.arange(rect.left, rect.right)[np.newaxis, :]
+        return self.cell_masks[rows, self.get_cell_x(rows, cols)]
+
+    def get_door_mask(self, pos):
+        """
+        Get the door mask of one square of the board.
+        Requires the board to have a door table.
+
+        Parameters:
+            pos : Position
+                x, y coordinates of square. (0, 0) = (left, top)
+
+        Returns
+            door_mask : int
+                door mask of the square
+        """
+        return self.cell_masks[pos.y, self.get_cell_x(pos.y, pos.x)]
+
+    def update_door_masks(self, rect=None):
+        """
+        Recalculate door masks from the placements for all or part of the board.
+        Does nothing if the board has no door table.
+
+        Keywords:
+            rect : pygame.Rect
+                area of board (in tiles) to be updated. Default is None, the whole board
+
+        Returns
+            edges_changed : logical
+                True if any door mask has changed (always True if no door table)
+        """
+        if self.cell_masks is None:
+            return True
+        if rect is None:
+            rect = self.rect
+        rows = np.arange(rect.top, rect.bottom)[:, np.newaxis]
+        cell_xs = self.get_cell_x(rows, np.arange(rect.left, rect.right)[np.newaxis, :])
+        masks = self.door_table.masks[
+            self.cells[rows, cell_xs, Board.TILE], self.cells[rows, cell_xs, Board.ROT]
+        ]
+        edges_changed = not np.array_equal(masks, self.cell_masks[rows, cell_xs])
+        self.cell_masks[rows, cell_xs] = masks
+        return edges_changed
+
+    def place_tile(self, pos, tile, rot=0):
+        """
+        Place a tile onto the board.
+        Set the position to the tile number and the orientation.
+
+        Parameters:
+            pos : Position
+                x, y coordinates of tile placement. (0, 0) = (left, top)
+            tile : int
+                number of tile to be placed
+            rot : int
+                rotation of tile to be placed
+        """
+        cell_x = self.get_cell_x(pos.y, pos.x)
+        self.cells[pos.y, cell_x, Board.TILE] = tile
+        self.cells[pos.y, cell_x, Board.ROT] = rot
+        self.changed(pygame.Rect(pos.x, pos.y, 1, 1))
+
+    def rotate_tile(self, pos, rotate):
+        """
+        Rotate a tile on the board. Reset the orientation.
+
+        Parameters:
+            pos : Position
+                x, y coordinates of tile placement. (0, 0) = (left, top)
+            rotate : int
+                rotate tile: +1 = 90 degrees anticlockwise. -1 = 90 degrees clockwise
+        """
+        cell_x = self.get_cell_x(pos.y, pos.x)
+        rot = self.cells[pos.y, cell_x, Board.ROT]
+        self.cells[pos.y, cell_x, Board.ROT] = (rot + rotate) % 4
+        self.changed(pygame.Rect(pos.x, pos.y, 1, 1))
+
+    def check_for_door(self, pos, dir, tiles, next=False):
+        """
+        Check if exit exists in a particular direction from a tile on the board
+
+        Parameters:
+            pos : Position
+                x, y coordinates of tile placement. (0, 0) = (left, top)
+            dir : int
+                Direction in which presence of door to be checked.
+                0 = up, 1 = left, 2 = down, 3 = right
+            tiles : TileSet.tiles
+                Tiles in use (not used if the board has a door table)
+
+        Keywords:
+            next : logical
+                If true check for door coming from next tile
+
+        Returns
+            door : logical
+                True if door is present, False if not
+        """
+        x = pos.x
+        y = pos.y
+        if next:
+            step_x, step_y = Position.STEPS[dir]
+            x += step_x
+            y += step_y
+            dir = (dir + 2) % 4
+        cell_x = self.get_cell_x(y, x)
+        if self.cell_masks is not None:
+            return (self.cell_masks[y, cell_x] >> dir) & 1
+        tile = self.cells[y, cell_x, Board.TILE]
+        rot = self.cells[y, cell_x, Board.ROT]
+        return tiles[tile].doors[(dir - rot) % 4]
+
+    def can_move(self, pos, dir):
+        """
+        Check if movement is possible from a tile to the next tile in a particular direction,
+        i.e. the next tile is on the board and there are doors on both sides.
+        Requires the board to have a door table.
+
+        Parameters:
+            pos : Position
+                x, y coordinates of tile placement. (0, 0) = (left, top)
+            dir : int
+                Direction of movement.
+                0 = up, 1 = left, 2 = down, 3 = right
+
+        Returns
+            passable : logical
+                True if movement is possible, False if not
+        """
+        step_x, step_y = Position.STEPS[dir]
+        next_x = pos.x + step_x
+        next_y = pos.y + step_y
+        if not (0 <= next_x < self.w and 0 <= next_y < self.h):
+            return False
+        mask = self.cell_masks[pos.y, self.get_cell_x(pos.y, pos.x)]
+        next_mask = self.cell_masks[next_y, self.get_cell_x(next_y, next_x)]
+        return bool(self.door_table.passable[mask, next_mask, dir])
+
+    def slide_row(self, row, dir, tile_bag, return_patch=True):
+        """
+        Slide row left or right 1 tile, by replacing the tile leaving the row
+        with a new tile from the tile bag and changing the row offset
+
+        Parameters:
+            row : int
+                (full) board y (tile) coordinate of row
+            dir : int
+                Direction in row to be slid
+                1 = left, 3 = right
+            tile_bag : TileBag
+                bag of tiles from which random ones can be drawn
+
+        Keywords:
+            return_patch : logical
+                If true return the patch (which needs the whole row). Default: True
+
+        Returns
+            patch_placements : numpy.array(h, w, n)
+                holds all information on the state of the each square on the board.in the 'patch'
+                (None if return_patch is False)
+        """
+        new_tile = np.array([tile_bag.draw_tile(), int(self.rng.integers(4))])
+        old_tile = self.shift_row(row, dir, new_tile)
+        tile_bag.return_tile(old_tile[Board.TILE])
+        for listener in self.listeners:
+            listener.board_changed(pygame.Rect(0, row, self.w, 1), True)
+
+        if return_patch:
+            patch_placements = np.empty([1, self.w + 1, self.n], dtype=int)
+            row_placements = self.get_region(pygame.Rect(0, row, self.w, 1))
+            if dir == Position.LEFT:
+                patch_placements[0, 0, :] = old_tile
+                patch_placements[0, 1:, :] = row_placements[0]
+            elif dir == Position.RIGHT:
+                patch_placements[0, : self.w, :] = row_placements[0]
+                patch_placements[0, self.w, :] = old_tile
+            return patch_placements
+
+    def slide_col(self, col, dir, tile_bag, return_patch=True):
+        """
+        Slide column up or down 1 tile, moving one tile in each row
+
+        Parameters:
+            col : int
+                (full) board x (tile) coordinate of column
+            dir : int
+                Direction in column to be slid
+                0 = up, 2 = down
+            tile_bag : TileBag
+                bag of tiles from which random ones can be drawn
+
+        Keywords:
+            return_patch : logical
+                If true return the patch. Default: True
+
+        Returns
+            patch_placements : numpy.array(h, w, n)
+                holds all information on the state of the each square on the board.in the 'patch'
+                (None if return_patch is False)
+        """
+        old_col = self.get_region(pygame.Rect(col, 0, 1, self.h))
+        new_tile = np.array([tile_bag.draw_tile(), int(self.rng.integers(4))])
+        old_tile = self.shift_col(col, dir, new_tile)
+        tile_bag.return_tile(old_tile[Board.TILE])
+        self.changed(pygame.Rect(col, 0, 1, self.h))
+        if return_patch:
+            return self.get_slide_patches(
+                old_col.transpose(1, 0, 2), dir == Position.UP, new_tile[None, None, :]
+            ).transpose(1, 0, 2)
+
+    def shift_row(self, row, dir, new_placement):
+        """
+        Slide row left or right 1 tile, by replacing the tile leaving the row
+        with a new tile and changing the row offset.
+        Listeners are not told of the change.
+
+        Parameters:
+            row : int
+                (full) board y (tile) coordinate of row
+            dir : int
+                Direction in row to be slid
+                1 = left, 3 = right
+            new_placement : numpy.array(n)
+                placement of new tile
+
+        Returns
+            old_placement : numpy.array(n)
+                placement of tile slid off the board
+        """
+        if dir == Position.LEFT:
+            cell_x = self.get_cell_x(row, 0)
+            self.row_offsets[row] += 1
+        elif dir == Position.RIGHT:
+            cell_x = self.get_cell_x(row, self.w - 1)
+            self.row_offsets[row] -= 1
+        else:
+            raise ValueError(f"row can only slide left (1) or right (3), not {dir}")
+        old_placement = self.cells[row, cell_x, :].copy()
+        self.cells[row, cell_x, :] = new_placement
+        if self.cell_masks is not None:
+            self.cell_masks[row, cell_x] = self.door_table.masks[
+                new_placement[Board.TILE], new_placement[Board.ROT]
+            ]
+        return old_placement
+
+    def shift_col(self, col, dir, new_placement):
+        """
+        Slide column up or down 1 tile, moving one tile in each row.
+        Door masks are not updated and listeners are not told of the change.
+
+        Parameters:
+            col : int
+                (full) board x (tile) coordinate of column
+            dir : int
+                Direction in column to be slid
+                0 = up, 2 = down
+            new_placement : numpy.array(n)
+                placement of new tile
+
+        Returns
+            old_placement : numpy.array(n)
+                placement of tile slid off the board
+        """
+        rows = np.arange(self.h)
+        cell_xs = self.get_cell_x(rows, col)
+        col_placements = self.cells[rows, cell_xs]
+        if dir == Position.UP:
+            old_placement = col_placements[0].copy()
+            col_placements[:-1] = col_placements[1:]
+            col_placements[-1] = new_placement
+        elif dir == Position.DOWN:
+            old_placement = col_placements[-1].copy()
+            col_placements[1:] = col_placements[:-1].copy()
+            col_placements[0] = new_placement
+        else:
+            raise ValueError(f"column can only slide up (0) or down (2), not {dir}")
+        self.cells[rows, cell_xs] = col_placements
+        return old_placement
+
+    def slide_lines(self, slides, new_placements, displaced, patches):
+        """
+        Apply a group of slides all of rows or all of columns (used by apply_slides),
+        one slide at a time through the row offsets
+
+        Parameters:
+            slides : numpy.array(k, 3)
+                slides, each (axis, index, dir), all with the same axis
+            new_placements : numpy.array(k, n)
+                placements of the new tile for each slide
+            displaced : list
+                list to which placements of tiles slid off the board are added
+            patches : list
+                list to which patches are added (None if not required)
+        """
+        axis = slides[0, 0]
+        lines, line_slides, line_dirs = self.get_slide_groups(slides)
+
+        if axis == Board.ROWS:
+            line_rects = [pygame.Rect(0, line, self.w, 1) for line in lines]
+        else:
+            line_rects = [pygame.Rect(line, 0, 1, self.h) for line in lines]
+        if patches is not None:
+            old_lines = [self.get_region(rect) for rect in line_rects]
+
+        for (axis, line, dir), new_placement in zip(slides, new_placements):
+            if axis == Board.ROWS:
+                old_placement = self.shift_row(line, dir, new_placement)
+            else:
+                old_placement = self.shift_col(line, dir, new_placement)
+            displaced.append(old_placement[np.newaxis, :])
+
+        for index, line in enumerate(lines):
+            if axis == Board.ROWS:
+                for listener in self.listeners:
+                    listener.board_changed(line_rects[index], True)
+            else:
+                self.changed(line_rects[index])
+            if patches is None:
+                continue
+            dir = line_dirs[index]
+            if dir is None:
+                patches.append((axis, line, None, None))
+                continue
+            old_line = old_lines[index]
+            if axis == Board.COLS:
+                old_line = old_line.transpose(1, 0, 2)
+            patch_line = self.get_slide_patches(
+                old_line,
+                dir in (Position.LEFT, Position.UP),
+                new_placements[line_slides[index]][np.newaxis, ...],
+            )
+            if axis == Board.COLS:
+                patch_line = patch_line.transpose(1, 0, 2)
+            patches.append((axis, line, dir, patch_line))
+
+
 #
 # Some tests in isolation
 #
@@ -305,7 +1550,7 @@ if __name__ == "__main__":
     # Create board and fill with tiles from tile bag
     print("Create Board")
     board_dim = Dimensions(5, 5)
-    board = Board(board_dim, tile_list=tile_list)
+    board = Board(board_dim, tile_list=tile_list, door_table=tile_set.door_table)
     print(board)
 
     # Place tile
@@ -358,8 +1603,105 @@ if __name__ == "__main__":
     door = board.check_for_door(pos, dir, tile_set.tiles, next=True)
     print(f"door is {door}")
 
+    # Check door masks and movement between tiles
+    print("\nCheck door masks")
+    print(f"door masks:\n{board.door_masks}")
+    for dir in Position.DIRECTIONS:
+        door = board.check_for_door(pos, dir, tile_set.tiles)
+        next_door = board.check_for_door(pos, dir, tile_set.tiles, next=True)
+        print(f"dir: {dir}  door: {door}  next door: {next_door}")
+        print(f"can move: {board.can_move(pos, dir)}")
+
     print()
 
+    # Check for a number of slides applied together
+    slides = [
+        (Board.ROWS, 0, Position.LEFT),
+        (Board.ROWS, 4, Position.RIGHT),
+        (Board.COLS, 2, Position.DOWN),
+        (Board.COLS, 2, Position.DOWN),
+    ]
+    print("\nApply slides")
+    print(f"slides: {slides}")
+    displaced_placements, patches = board.apply_slides(slides, tile_bag)
+    print(board)
+    print(f"displaced: {displaced_placements[:, Board.TILE]}")
+    for axis, line, dir, patch in patches:
+        print(f"axis: {axis}  line: {line}  dir: {dir}")
+        print(f"patch: {patch[..., Board.TILE].ravel()}")
+
+    # Slides applied together need no more tiles in the bag than one at a time
+    small_bag = TileBag(TileSet(doors_for_tiles, {0: 1, 1: 1, 2: 0, 3: 0, 4: 0}))
+    slides = [(Board.ROWS, row, Position.LEFT) for row in range(board.h)] * 2
+    displaced_placements, patches = board.apply_slides(slides, small_bag)
+    assert len(displaced_placements) == len(slides) and len(small_bag) == 2
+    print(f"Applied {len(slides)} slides with {len(small_bag)} tiles in the bag")
+
+    # Check compact board gives the same placements
+    compact_board = Board(
+        board_dim, tile_list=tile_list, door_table=tile_set.door_table, compact=True
+    )
+    print("\nCompact board")
+    print(compact_board)
+    print(f"packed placements:\n{compact_board.placements.packed}")
+    print(f"tiles:\n{compact_board.placements[..., Board.TILE]}")
+
+    # Check for slide row on a toroidal board
+    toroidal_board = ToroidalBoard(
+        board_dim, tile_list=tile_list, door_table=tile_set.door_table
+    )
+    row = 1
+    dir = Position.LEFT
+    print("\nSlide row of toroidal board")
+    print(f"row: {row}  dir: {dir}")
+    patch = toroidal_board.slide_row(row, dir, tile_bag)
+    print(toroidal_board)
+    print(f"row offsets: {toroidal_board.row_offsets}")
+    print(f"\npatch: {patch}")
+
+    # Writing to the placements of a toroidal board (a copy) is an error,
+    # rather than silently changing nothing
+    try:
+        toroidal_board.placements[0, 0, Board.ROT] = 1
+        raise AssertionError("write to toroidal board placements not refused")
+    except ValueError:
+        print("Write to toroidal board placements refused")
+    pos = Position(2, row)
+    toroidal_board.rotate_tile(pos, 1)
+    assert toroidal_board.get_placement(pos) == tuple(
+        toroidal_board.placements[pos.y, pos.x]
+    )
+    assert toroidal_board.get_door_mask(pos) == toroidal_board.door_masks[pos.y, pos.x]
+
+    # Sliding a row up or down (or a column left or right) is an error
+    for test_board in (board, toroidal_board):
+        for slide, bad_dir in (
+            (test_board.slide_row, Position.UP),
+            (test_board.slide_col, Position.LEFT),
+        ):
+            try:
+                slide(1, bad_dir, tile_bag)
+                raise AssertionError(f"{slide.__name__} {bad_dir} not refused")
+            except ValueError as error:
+                print(f"Refused: {error}")
+
+    # Check save and open (memory-mapped)
+    import tempfile
+
+    board_path = tempfile.mkdtemp()
+    board.save(board_path, tile_set=tile_set)
+    opened_board = Board.open(board_path)
+    print("\nOpened board")
+    print(opened_board)
+    print(f"tile set:\n{Board.open_tile_set(board_path)}")
+
+    # Door masks not saved are written on open, so only computed once
+    os.remove(os.path.join(board_path, Board.DOOR_MASKS_FILE))
+    opened_board = Board.open(board_path, door_table=tile_set.door_table)
+    assert os.path.exists(os.path.join(board_path, Board.DOOR_MASKS_FILE))
+    assert isinstance(opened_board.door_masks, np.memmap)
+    assert np.array_equal(opened_board.door_masks, board.door_masks)
+
     # Check for patch
     patch_rect = pygame.Rect(0, 0, 2, 2)
     patch_placements = board.get_patch(patch_rect, tile_bag)
@@ -0,0 +1,523 @@
+"""
+Chunks
+
+History
+18-Oct-2026 - Initial version - board of unlimited size made of chunks of tiles
+              generated when first used, with least recently used chunks removed
+              from memory (and optionally saved to disk)
+18-Oct-2026 - Rotations of chunks filled from the tile bag drawn from a random number
+              generator given to the board
+18-Oct-2026 - A chunk just loaded is never removed at once, changed chunks are kept in
+              memory if there is no spill directory, and a board filled from the tile
+              bag requires a spill directory (so no changes are lost)
+"""
+import os
+from collections import OrderedDict
+import numpy as np
+
+from board import *
+from position import *
+
+
+class ChunkedBoard:
+    """
+    Represents a board of unlimited size for the Shifting Maze game, made up of square
+    chunks of tiles. Each chunk is generated when first used, either from the tile bag
+    or, if a seed is given, from a random number generator seeded for that chunk
+    (so that the same chunk is always generated again).
+
+    Only a limited number of chunks are held in memory. When there are too many,
+    the least recently used chunk that is not near a player is removed.
+    If a spill directory is given, removed chunks are saved there and loaded again
+    when next used. Otherwise only chunks that can be generated again from the seed
+    (i.e. not changed) are removed, and changed chunks are kept in memory (so memory
+    grows with the number of chunks changed). A board filled from the tile bag
+    requires a spill directory, as its chunks cannot be generated again.
+
+    Board positions can be any integers, including negative ones.
+
+    Attributes:
+        chunk_size : int
+            length of the side of a chunk in tiles
+        n : int
+            number of board square attributes (Board.TILE, Board.ROT)
+        chunks : OrderedDict
+            placements (numpy.array(chunk_size, chunk_size, n)) of each chunk held in memory,
+            indexed by the chunk coordinates (chunk_x, chunk_y),
+            in order of use (least recently used first)
+        changed_chunks : set
+            chunk coordinates of chunks held in memory that have been changed
+            since generated (or loaded)
+        near_chunks : set
+            chunk coordinates of chunks near a player, which are not removed
+        max_chunks : int
+            maximum number of chunks held in memory
+        spill_dir : str
+            directory where removed chunks are saved (None if not saved)
+        tile_bag : TileBag
+            bag of tiles from which chunks are filled (None if seeded)
+        seed : int
+            seed from which chunks are generated (None if from tile bag)
+        door_table : DoorTable
+            precomputed door masks for the tile set in use (None if not provided)
+        rng : numpy.random.Generator
+            random number generator for the rotations of chunks filled from the tile bag
+    """
+
+    def __init__(
+        self,
+        tile_bag=None,
+        tile_set=None,
+        seed=None,
+        chunk_size=64,
+        max_chunks=256,
+        spill_dir=None,
+        door_table=None,
+        rng=None,
+    ):
+        """
+        Keywords:
+            tile_bag : TileBag
+                bag of tiles from which chunks are filled, if no seed given
+            tile_set : TileSet
+                set of tiles whose tile counts give the chance of each tile,
+                if chunks are generated from a seed
+            seed : int
+                seed from which chunks are generated. Default is None, fill from tile bag
+            chunk_size : int
+                length of the side of a chunk in tiles. Default: 64
+            max_chunks : int
+                maximum number of chunks held in memory. Default: 256
+            spill_dir : str
+                directory where removed chunks are saved. Default is None, not saved
+                (only allowed with a seed)
+            door_table : DoorTable
+                precomputed door masks used for door checks (e.g. TileSet.door_table)
+            rng : numpy.random.Generator
+                random number generator for the rotations of chunks filled from
+                the tile bag. Default is None, a new generator
+        """
+        if seed is None and spill_dir is None:
+            raise ValueError("chunks filled from the tile bag require a spill_dir")
+
+        self.chunk_size = chunk_size
+        self.n = 2
+        self.chunks = OrderedDict()
+        self.changed_chunks = set()
+        self.near_chunks = set()
+        self.max_chunks = max_chunks
+        self.spill_dir = spill_dir
+        self.tile_bag = tile_bag
+        self.seed = seed
+        self.door_table = door_table
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+        if seed is not None:
+            tile_numbers = sorted(tile_set.tile_counts)
+            counts = np.array([tile_set.tile_counts[t] for t in tile_numbers])
+            self.tile_numbers = np.array(tile_numbers)
+            self.tile_chances = counts / counts.sum()
+
+        if spill_dir is not None:
+            os.makedirs(spill_dir, exist_ok=True)
+
+    def get_chunk_coords(self, x, y):
+        """
+        Get the chunk coordinates of a board position and the position within the chunk
+
+        Parameters:
+            x : int
+                board x (tile) coordinate
+            y : int
+                board y (tile) coordinate
+
+        Returns
+            chunk_coords : tuple
+                (chunk_x, chunk_y) coordinates of chunk
+            chunk_pos : tuple
+                (x, y) coordinates within chunk
+        """
+        chunk_x, in_x = divmod(x, self.chunk_size)
+        chunk_y, in_y = divmod(y, self.chunk_size)
+        return (chunk_x, chunk_y), (in_x, in_y)
+
+    def get_spill_path(self, chunk_coords):
+        """
+        Get the path of the file for a chunk saved in the spill directory
+
+        Parameters:
+            chunk_coords : tuple
+                (chunk_x, chunk_y) coordinates of chunk
+
+        Returns
+            path : str
+                path of file
+        """
+        return os.path.join(
+            self.spill_dir, f"chunk_{chunk_coords[0]}_{chunk_coords[1]}.npy"
+        )
+
+    def generate_chunk(self, chunk_coords):
+        """
+        Generate a new chunk from the tile bag or the seed
+
+        Parameters:
+            chunk_coords : tuple
+                (chunk_x, chunk_y) coordinates of chunk
+
+        Returns
+            chunk : numpy.array(chunk_size, chunk_size, n)
+                placements of chunk
+        """
+        size = self.chunk_size
+        chunk = np.empty([size, size, self.n], dtype=int)
+        if self.seed is not None:
+            # seed sequences take non-negative integers, so interleave the signs
+            keys = [2 * c if c >= 0 else -2 * c - 1 for c in chunk_coords]
+            rng = np.random.default_rng([self.seed] + keys)
+            chunk[..., Board.TILE] = rng.choice(
+                self.tile_numbers, size=(size, size), p=self.tile_chances
+            )
+            chunk[..., Board.ROT] = rng.integers(4, size=(size, size))
+        else:
+            chunk[..., Board.TILE] = np.reshape(
+                self.tile_bag.draw_tiles(size * size), (size, size)
+            )
+            chunk[..., Board.ROT] = self.rng.integers(4, size=(size, size))
+        return chunk
+
+    def get_chunk(self, chunk_coords):
+        """
+        Get a chunk, loading or generating it if not in memory,
+        and removing least recently used chunks if there are too many
+
+        Parameters:
+            chunk_coords : tuple
+                (chunk_x, chunk_y) coordinates of chunk
+
+        Returns
+            chunk : numpy.array(chunk_size, chunk_size, n)
+                placements of chunk
+        """
+        chunk = self.chunks.get(chunk_coords)
+        if chunk is not None:
+            self.chunks.move_to_end(chunk_coords)
+            return chunk
+
+        if self.spill_dir is not None and os.path.exists(
+            self.get_spill_path(chunk_coords)
+        ):
+            chunk = np.load(self.get_spill_path(chunk_coords))
+        else:
+            chunk = self.generate_chunk(chunk_coords)
+        self.chunks[chunk_coords] = chunk
+        self.remove_chunks(keep=chunk_coords)
+        return chunk
+
+    def can_remove(self, chunk_coords):
+        """
+        Check if a chunk can be removed from memory without losing it,
+        i.e. it is not near a player and it can be saved or generated again
+
+        Parameters:
+            chunk_coords : tuple
+                (chunk_x, chunk_y) coordinates of chunk
+
+        Returns
+            removable : logical
+                True if the chunk can be removed, False if not
+        """
+        if chunk_coords in self.near_chunks:
+            return False
+        return self.spill_dir is not None or chunk_coords not in self.changed_chunks
+
+    def remove_chunks(self, keep=None):
+        """
+        Remove least recently used chunks that can be removed
+        until there are no more than the maximum number in memory
+
+        Keywords:
+            keep : tuple
+                (chunk_x, chunk_y) coordinates of a chunk not to be removed,
+                e.g. the chunk just loaded. Default is None, none kept
+        """
+        for chunk_coords in list(self.chunks):
+            if len(self.chunks) <= self.max_chunks:
+                break
+            if chunk_coords == keep or not self.can_remove(chunk_coords):
+                continue
+            self.remove_chunk(chunk_coords)
+
+    def remove_chunk(self, chunk_coords):
+        """
+        Remove a chunk from memory, saving it to the spill directory if required
+
+        Parameters:
+            chunk_coords : tuple
+                (chunk_x, chunk_y) coordinates of chunk
+        """
+        chunk = self.chunks.pop(chunk_coords)
+        changed = chunk_coords in self.changed_chunks
+        self.changed_chunks.discard(chunk_coords)
+        if changed or self.seed is None:
+            np.save(self.get_spill_path(chunk_coords), chunk)
+
+    def keep_near(self, positions, distance=1):
+        """
+        Set the chunks near players, which are not removed from memory
+
+        Parameters:
+            positions : list
+                Position of each player
+
+        Keywords:
+            distance : int
+                number of chunks in each direction around the chunk
+                containing a player that are kept. Default: 1
+        """
+        self.near_chunks = set()
+        for pos in positions:
+            (chunk_x, chunk_y), _ = self.get_chunk_coords(pos.x, pos.y)
+            for near_y in range(chunk_y - distance, chunk_y + distance + 1):
+                for near_x in range(chunk_x - distance, chunk_x + distance + 1):
+                    self.near_chunks.add((near_x, near_y))
+
+    def get_placement(self, pos):
+        """
+        Get the tile number and rotation at a position on the board
+
+        Parameters:
+            pos : Position
+                x, y coordinates of tile placement
+
+        Returns
+            tile : int
+                number of tile
+            rot : int
+                rotation of tile
+        """
+        chunk_coords, (in_x, in_y) = self.get_chunk_coords(pos.x, pos.y)
+        chunk = self.get_chunk(chunk_coords)
+        return chunk[in_y, in_x, Board.TILE], chunk[in_y, in_x, Board.ROT]
+
+    def place_tile(self, pos, tile, rot=0):
+        """
+        Place a tile onto the board.
+        Set the position to the tile number and the orientation.
+
+        Parameters:
+            pos : Position
+                x, y coordinates of tile placement
+            tile : int
+                number of tile to be placed
+            rot : int
+                rotation of tile to be placed
+        """
+        chunk_coords, (in_x, in_y) = self.get_chunk_coords(pos.x, pos.y)
+        chunk = self.get_chunk(chunk_coords)
+        chunk[in_y, in_x, Board.TILE] = tile
+        chunk[in_y, in_x, Board.ROT] = rot
+        self.changed_chunks.add(chunk_coords)
+
+    def rotate_tile(self, pos, rotate):
+        """
+        Rotate a tile on the board. Reset the orientation.
+
+        Parameters:
+            pos : Position
+                x, y coordinates of tile placement
+            rotate : int
+                rotate tile: +1 = 90 degrees anticlockwise. -1 = 90 degrees clockwise
+        """
+        chunk_coords, (in_x, in_y) = self.get_chunk_coords(pos.x, pos.y)
+        chunk = self.get_chunk(chunk_coords)
+        chunk[in_y, in_x, Board.ROT] = (chunk[in_y, in_x, Board.ROT] + rotate) % 4
+        self.changed_chunks.add(chunk_coords)
+
+    def get_region(self, rect):
+        """
+        Get the placements for an area of the board
+
+        Parameters:
+            rect : pygame.Rect
+                area of board (in tiles)
+
+        Returns
+            region_placements : numpy.array(h, w, n)
+                holds all information on the state of the each square in the area
+        """
+        region_placements = np.empty([rect.h, rect.w, self.n], dtype=int)
+        size = self.chunk_size
+        first_chunk_x = rect.left // size
+        first_chunk_y = rect.top // size
+        for chunk_y in range(first_chunk_y, (rect.bottom - 1) // size + 1):
+            for chunk_x in range(first_chunk_x, (rect.right - 1) // size + 1):
+                chunk_rect = pygame.Rect(chunk_x * size, chunk_y * size, size, size)
+                overlap = chunk_rect.clip(rect)
+                chunk = self.get_chunk((chunk_x, chunk_y))
+                region_placements[
+                    overlap.top - rect.top : overlap.bottom - rect.top,
+                    overlap.left - rect.left : overlap.right - rect.left,
+                ] = chunk[
+                    overlap.top - chunk_rect.top : overlap.bottom - chunk_rect.top,
+                    overlap.left - chunk_rect.left : overlap.right - chunk_rect.left,
+                ]
+        return region_placements
+
+    def get_patch(self, patch_rect, tile_bag=None):
+        """
+        Get a patch (area of tiles), generating any chunks required
+
+        Parameters:
+            patch_rect : pygame.Rect
+                Defines the patch of tiles required
+
+        Keywords:
+            tile_bag : TileBag
+                not used, as tiles are drawn when chunks are generated
+
+        Returns
+            patch_placements : numpy.array(h, w, n)
+                holds all information on the state of the each square on the board.in the 'patch'
+        """
+        return self.get_region(patch_rect)
+
+    def get_door_masks(self, rect):
+        """
+        Get the door masks for an area of the board.
+        Requires the board to have a door table.
+
+        Parameters:
+            rect : pygame.Rect
+                area of board (in tiles)
+
+        Returns
+            door_masks : numpy.array(h, w)
+                door mask for each square in the area
+        """
+        region_placements = self.get_region(rect)
+        return self.door_table.masks[
+            region_placements[..., Board.TILE], region_placements[..., Board.ROT]
+        ]
+
+    def check_for_door(self, pos, dir, tiles, next=False):
+        """
+        Check if exit exists in a particular direction from a tile on the board
+
+        Parameters:
+            pos : Position
+                x, y coordinates of tile placement
+            dir : int
+                Direction in which presence of door to be checked.
+                0 = up, 1 = left, 2 = down, 3 = right
+            tiles : TileSet.tiles
+                Tiles in use (not used if the board has a door table)
+
+        Keywords:
+            next : logical
+                If true check for door coming from next tile
+
+        Returns
+            door : logical
+                True if door is present, False if not
+        """
+        if next:
+            pos = pos.get_next(dir)
+            dir = (dir + 2) % 4
+        tile, rot = self.get_placement(pos)
+        if self.door_table is not None:
+            return (self.door_table.masks[tile, rot] >> dir) & 1
+        return tiles[tile].doors[(dir - rot) % 4]
+
+    def can_move(self, pos, dir):
+        """
+        Check if movement is possible from a tile to the next tile in a particular direction,
+        i.e. there are doors on both sides. Requires the board to have a door table.
+
+        Parameters:
+            pos : Position
+                x, y coordinates of tile placement
+            dir : int
+                Direction of movement.
+                0 = up, 1 = left, 2 = down, 3 = right
+
+        Returns
+            passable : logical
+                True if movement is possible, False if not
+        """
+        masks = self.door_table.masks
+        mask = masks[self.get_placement(pos)]
+        next_mask = masks[self.get_placement(pos.get_next(dir))]
+        return bool(self.door_table.passable[mask, next_mask, dir])
+
+
+#
+# Some tests in isolation
+#
+if __name__ == "__main__":
+    import tempfile
+
+    print("START TESTING")
+
+    # Create a tile set and fill tile bag
+    doors_for_tiles = {
+        0: [1, 1, 1, 1],
+        1: [0, 1, 1, 1],
+        2: [0, 0, 1, 1],
+        3: [0, 1, 0, 1],
+        4: [0, 0, 0, 1],
+    }
+    tile_counts = {0: 40, 1: 140, 2: 80, 3: 80, 4: 20}
+    tile_set = TileSet(doors_for_tiles, tile_counts, name="standard")
+
+    # Seeded board, keeping only 4 chunks in memory
+    spill_dir = tempfile.mkdtemp()
+    board = ChunkedBoard(
+        tile_set=tile_set,
+        seed=1,
+        chunk_size=4,
+        max_chunks=4,
+        spill_dir=spill_dir,
+        door_table=tile_set.door_table,
+    )
+    patch_rect = pygame.Rect(-3, -3, 7, 7)
+    print(f"Patch {patch_rect}:\n{board.get_patch(patch_rect)[..., Board.TILE]}")
+    print(f"Chunks in memory: {list(board.chunks)}")
+
+    # Change a tile, move far away and come back
+    pos = Position(-1, -1)
+    board.place_tile(pos, 4, rot=2)
+    print(f"Placed tile: {board.get_placement(pos)}")
+    board.get_patch(pygame.Rect(100, 100, 10, 10))
+    print(f"Chunks in memory: {list(board.chunks)}")
+    print(f"Chunks saved: {sorted(os.listdir(spill_dir))}")
+    print(f"Patch {patch_rect}:\n{board.get_patch(patch_rect)[..., Board.TILE]}")
+
+    # Check for door
+    dir = Position.UP
+    print(f"pos: {pos}  dir: {dir}")
+    print(f"door: {board.check_for_door(pos, dir, tile_set.tiles)}")
+    print(f"can move: {board.can_move(pos, dir)}")
+
+    # The chunk just loaded is returned in memory, even if all others are near
+    board.keep_near([Position(0, 0)], distance=2)
+    board.get_patch(pygame.Rect(-8, -8, 20, 20))
+    chunk_coords, _ = board.get_chunk_coords(100, 100)
+    assert board.get_chunk(chunk_coords) is board.chunks[chunk_coords]
+    board.keep_near([])
+
+    # Without a spill directory changed chunks are kept, not generated again
+    board = ChunkedBoard(tile_set=tile_set, seed=1, chunk_size=4, max_chunks=4)
+    board.rotate_tile(pos, 1)
+    rotated = board.get_placement(pos)
+    board.get_patch(pygame.Rect(100, 100, 10, 10))
+    assert board.get_placement(pos) == rotated
+    print(f"Rotation kept without spill directory: {rotated}")
+
+    # Without a spill directory a board filled from the tile bag is refused
+    try:
+        ChunkedBoard(tile_bag=TileBag(tile_set), chunk_size=4)
+    except ValueError as error:
+        print(f"Refused: {error}")
+    else:
+        raise AssertionError("tile bag board without spill directory not refused")
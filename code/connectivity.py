@@ -0,0 +1,390 @@
+"""
+Connectivity
+
+History
+18-Oct-2026 - Initial version - connected areas of the maze kept up to date
+              as the board changes, only relabelling the blocks affected
+18-Oct-2026 - Links across block edges kept for each edge and found again only for
+              the blocks affected, with the groups joined up as a graph of groups
+"""
+import numpy as np
+
+from board import *
+from position import *
+
+
+def label_groups(n, a, b):
+    """
+    Find connected groups of nodes (union-find) using whole array operations.
+    Each node ends up pointing to the lowest numbered node in its group.
+
+    Parameters:
+        n : int
+            number of nodes
+        a : numpy.array
+            first node of each link
+        b : numpy.array
+            second node of each link
+
+    Returns
+        roots : numpy.array(n)
+            lowest numbered node in the group of each node
+    """
+    roots = np.arange(n)
+    while len(a):
+        root_a = roots[a]
+        root_b = roots[b]
+        linked = root_a != root_b
+        if not linked.any():
+            break
+        a = a[linked]
+        b = b[linked]
+        high = np.maximum(root_a[linked], root_b[linked])
+        low = np.minimum(root_a[linked], root_b[linked])
+        np.minimum.at(roots, high, low)
+        while True:
+            next_roots = roots[roots]
+            if np.array_equal(next_roots, roots):
+                break
+            roots = next_roots
+    return roots
+
+
+class Connectivity:
+    """
+    Keeps track of which rooms (squares) of the maze are connected to each other,
+    i.e. can be reached from each other by moving through doors.
+
+    The board is split into square blocks. The rooms are first grouped within
+    each block and then the groups are joined up across the block edges.
+    When the board changes only the blocks affected are regrouped, and only the
+    links across the edges of those blocks are found again, which is left until
+    the next query so a number of changes can be handled together. The groups are
+    then joined up using just the groups and the links between them, a small
+    graph compared to the board.
+
+    Attributes:
+        board : Board
+            board being tracked (must have a door table)
+        block : int
+            length of the side of a block in tiles
+        groups : numpy.array(h, w)
+            flat board index (y * w + x) of the first room of the group
+            within its block that each room belongs to
+        block_groups : dict
+            sorted group identifiers (as in groups) in each block,
+            indexed by (block y, block x)
+        links : dict
+            pairs of arrays of groups linked by doors across each block edge, indexed by
+            ("right" or "down", block y, block x) of the block to the left or above
+        group_ids : numpy.array
+            sorted identifiers of all the groups on the board
+        areas : numpy.array
+            flat board index of the room identifying the connected area
+            each group (in the order of group_ids) belongs to.
+            None if the board has changed since the areas were found
+        dirty : numpy.array(blocks_h, blocks_w)
+            True for each block that needs to be regrouped
+    """
+
+    def __init__(self, board, block=32):
+        """
+        Parameters:
+            board : Board
+                board to be tracked (must have a door table)
+
+        Keywords:
+            block : int
+                length of the side of a block in tiles. Default: 32
+        """
+        self.board = board
+        self.block = block
+        self.groups = np.empty([board.h, board.w], dtype=np.intp)
+        self.block_groups = {}
+        self.links = {}
+        self.group_ids = None
+        self.areas = None
+        self.dirty = np.ones([-(-board.h // block), -(-board.w // block)], dtype=bool)
+        board.add_listener(self)
+
+    def board_changed(self, rect, edges_changed):
+        """
+        Mark the blocks covering a changed area of the board to be regrouped
+
+        Parameters:
+            rect : pygame.Rect
+                area of board (in tiles) that has changed
+            edges_changed : logical
+                True if any doors have changed
+        """
+        if not edges_changed:
+            return
+        self.dirty[
+            rect.top // self.block : (rect.bottom - 1) // self.block + 1,
+            rect.left // self.block : (rect.right - 1) // self.block + 1,
+        ] = True
+        self.areas = None
+
+    def get_block_rect(self, block_y, block_x):
+        """
+        Get the area of the board covered by a block
+
+        Parameters:
+            block_y : int
+                y index of block
+            block_x : int
+                x index of block
+
+        Returns
+            rect : pygame.Rect
+                area of board (in tiles), cut short at the edge of the board
+        """
+        top = block_y * self.block
+        left = block_x * self.block
+        return pygame.Rect(
+            left,
+            top,
+            min(left + self.block, self.board.w) - left,
+            min(top + self.block, self.board.h) - top,
+        )
+
+    def regroup(self, rect):
+        """
+        Group rooms connected within each block for an area of the board
+
+        Parameters:
+            rect : pygame.Rect
+                area of board (in tiles), must be on block boundaries
+                (or the edge of the board)
+        """
+        masks = self.board.get_door_masks(rect)
+        h, w = masks.shape
+        index = np.arange(h * w).reshape(h, w)
+
+        right = (
+            (masks[:, :-1] >> Position.RIGHT) & (masks[:, 1:] >> Position.LEFT)
+        ) & 1
+        right[:, (rect.left + np.arange(1, w)) % self.block == 0] = 0
+        down = ((masks[:-1, :] >> Position.DOWN) & (masks[1:, :] >> Position.UP)) & 1
+        down[(rect.top + np.arange(1, h)) % self.block == 0, :] = 0
+
+        right_y, right_x = np.nonzero(right)
+        down_y, down_x = np.nonzero(down)
+        a = np.concatenate([index[right_y, right_x], index[down_y, down_x]])
+        b = np.concatenate([index[right_y, right_x + 1], index[down_y + 1, down_x]])
+        roots = label_groups(h * w, a, b)
+
+        root_y = rect.top + roots // w
+        root_x = rect.left + roots % w
+        self.groups[rect.top : rect.bottom, rect.left : rect.right] = (
+            root_y * self.board.w + root_x
+        ).reshape(h, w)
+
+    def find_links(self, edge, block_y, block_x):
+        """
+        Find the groups linked by doors across the right or bottom edge of a block
+
+        Parameters:
+            edge : str
+                "right" or "down"
+            block_y : int
+                y index of block
+            block_x : int
+                x index of block
+
+        Returns
+            a : numpy.array
+                group on this side of each door
+            b : numpy.array
+                group on the other side of each door
+        """
+        rect = self.get_block_rect(block_y, block_x)
+        groups = self.groups
+        if edge == "right":
+            x = rect.right - 1
+            masks = self.board.get_door_masks(pygame.Rect(x, rect.top, 2, rect.h))
+            doors = (masks[:, 0] >> Position.RIGHT) & (masks[:, 1] >> Position.LEFT) & 1
+            ys = rect.top + np.nonzero(doors)[0]
+            return groups[ys, x], groups[ys, x + 1]
+        else:
+            y = rect.bottom - 1
+            masks = self.board.get_door_masks(pygame.Rect(rect.left, y, rect.w, 2))
+            doors = (masks[0] >> Position.DOWN) & (masks[1] >> Position.UP) & 1
+            xs = rect.left + np.nonzero(doors)[0]
+            return groups[y, xs], groups[y + 1, xs]
+
+    def update(self):
+        """
+        Regroup any blocks affected by changes, find the links across their edges
+        again and join up the groups across the block edges
+        """
+        if self.areas is not None:
+            return
+
+        blocks_h, blocks_w = self.dirty.shape
+        dirty_blocks = [tuple(block) for block in np.argwhere(self.dirty)]
+        for block_y in np.nonzero(self.dirty.any(axis=1))[0]:
+            block_xs = np.nonzero(self.dirty[block_y])[0]
+            start = self.get_block_rect(block_y, block_xs[0])
+            end = self.get_block_rect(block_y, block_xs[-1])
+            self.regroup(start.union(end))
+        self.dirty[...] = False
+
+        # only the edges of the blocks regrouped can have changed links
+        edges = set()
+        for block_y, block_x in dirty_blocks:
+            rect = self.get_block_rect(block_y, block_x)
+            self.block_groups[block_y, block_x] = np.unique(
+                self.groups[rect.top : rect.bottom, rect.left : rect.right]
+            )
+            if block_x + 1 < blocks_w:
+                edges.add(("right", block_y, block_x))
+            if block_x > 0:
+                edges.add(("right", block_y, block_x - 1))
+            if block_y + 1 < blocks_h:
+                edges.add(("down", block_y, block_x))
+            if block_y > 0:
+                edges.add(("down", block_y - 1, block_x))
+        for edge in edges:
+            self.links[edge] = self.find_links(*edge)
+
+        # join up the groups, numbering them in order of group identifier
+        self.group_ids = np.sort(np.concatenate(list(self.block_groups.values())))
+        if self.links:
+            a = np.concatenate([a for a, b in self.links.values()])
+            b = np.concatenate([b for a, b in self.links.values()])
+        else:
+            a = b = np.empty(0, dtype=np.intp)
+        roots = label_groups(
+            len(self.group_ids),
+            np.searchsorted(self.group_ids, a),
+            np.searchsorted(self.group_ids, b),
+        )
+        self.areas = self.group_ids[roots]
+
+    def get_area(self, pos):
+        """
+        Get the identifier of the connected area containing a room
+
+        Parameters:
+            pos : Position
+                x, y coordinates of room. (0, 0) = (left, top)
+
+        Returns
+            area : int
+                flat board index of the room identifying the connected area
+        """
+        self.update()
+        group = self.groups[pos.y, pos.x]
+        return self.areas[np.searchsorted(self.group_ids, group)]
+
+    def is_connected(self, pos, other_pos):
+        """
+        Check if a room can be reached from another
+
+        Parameters:
+            pos : Position
+                x, y coordinates of first room
+            other_pos : Position
+                x, y coordinates of second room
+
+        Returns
+            connected : logical
+                True if the rooms are connected
+        """
+        return self.get_area(pos) == self.get_area(other_pos)
+
+    def get_reachable(self, pos):
+        """
+        Get all the rooms that can be reached from a room
+
+        Parameters:
+            pos : Position
+                x, y coordinates of room. (0, 0) = (left, top)
+
+        Returns
+            reachable : numpy.array(h, w)
+                True for each room that can be reached
+        """
+        area = self.get_area(pos)
+        return self.get_areas() == area
+
+    def get_areas(self):
+        """
+        Get the connected area of every room on the board
+
+        Returns
+            areas : numpy.array(h, w)
+                flat board index of the room identifying the connected area of each room
+        """
+        self.update()
+        return self.areas[np.searchsorted(self.group_ids, self.groups)]
+
+
+#
+# Some tests in isolation
+#
+if __name__ == "__main__":
+    print("START TESTING")
+
+    # Create a tile set and board
+    doors_for_tiles = {
+        0: [1, 1, 1, 1],
+        1: [0, 1, 1, 1],
+        2: [0, 0, 1, 1],
+        3: [0, 1, 0, 1],
+        4: [0, 0, 0, 1],
+    }
+    tile_counts = {0: 40, 1: 140, 2: 80, 3: 80, 4: 20}
+    tile_set = TileSet(doors_for_tiles, tile_counts, name="standard")
+    tile_bag = TileBag(tile_set)
+    board = Board(Dimensions(7, 7), tile_bag=tile_bag, door_table=tile_set.door_table)
+    print(board)
+
+    # Use small blocks so that groups are joined across block edges
+    connectivity = Connectivity(board, block=3)
+    pos = Position(3, 3)
+    print(f"Connected areas:\n{connectivity.get_areas()}")
+    print(f"Reachable from {pos}:\n{connectivity.get_reachable(pos).astype(int)}")
+
+    # Slide a row and check again
+    board.slide_row(3, Position.LEFT, tile_bag)
+    print(board)
+    print(f"Connected areas:\n{connectivity.get_areas()}")
+    print(
+        f"{pos} connected to {Position(0, 0)}: "
+        f"{connectivity.is_connected(pos, Position(0, 0))}"
+    )
+
+    # Check against grouping the whole board at once, asking for the rooms
+    # reachable first (before anything else has brought the areas up to date)
+    def get_areas_full(board):
+        masks = board.door_masks
+        index = np.arange(board.size).reshape(board.h, board.w)
+        right = (masks[:, :-1] >> Position.RIGHT) & (masks[:, 1:] >> Position.LEFT) & 1
+        down = (masks[:-1, :] >> Position.DOWN) & (masks[1:, :] >> Position.UP) & 1
+        right_y, right_x = np.nonzero(right)
+        down_y, down_x = np.nonzero(down)
+        a = np.concatenate([index[right_y, right_x], index[down_y, down_x]])
+        b = np.concatenate([index[right_y, right_x + 1], index[down_y + 1, down_x]])
+        return label_groups(board.size, a, b).reshape(board.h, board.w)
+
+    tile_counts = {0: 4000, 1: 14000, 2: 8000, 3: 8000, 4: 2000}
+    tile_set = TileSet(doors_for_tiles, tile_counts, name="standard")
+    tile_bag = TileBag(tile_set)
+    board = Board(Dimensions(51, 51), tile_bag=tile_bag, door_table=tile_set.door_table)
+    connectivity = Connectivity(board, block=8)
+    pos = Position(25, 25)
+    full = get_areas_full(board)
+    assert np.array_equal(connectivity.get_reachable(pos), full == full[25, 25])
+    for change in range(20):
+        if change % 3 == 0:
+            board.slide_row(change * 7 % board.h, Position.LEFT, tile_bag)
+        elif change % 3 == 1:
+            board.slide_col(change * 5 % board.w, Position.DOWN, tile_bag)
+        else:
+            board.rotate_tile(Position(change * 3 % board.w, change), 1)
+        full = get_areas_full(board)
+        assert np.array_equal(connectivity.get_reachable(pos), full == full[25, 25])
+        assert np.array_equal(connectivity.get_areas(), full)
+    print("Reachable rooms match grouping the whole board after slides and rotations")
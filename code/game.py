@@ -4,7 +4,20 @@ Main game control code
 History
 24-Jul-2021 - Initial version
 21-Aug-2021 - Simplified control
+18-Oct-2026 - Board uses the tile set door table for door checks
+18-Oct-2026 - Connectivity used to report rooms reachable by the player
+18-Oct-2026 - Clicking on a room reports the shortest path to it from the player
+18-Oct-2026 - Tiles on the board read with Board.get_placement
+18-Oct-2026 - Board can be opened from a file saved with Board.save
+18-Oct-2026 - All random numbers drawn from named streams derived from one seed,
+              so that a game can be reproduced
+18-Oct-2026 - Rendered tile images kept in a cache directory for fast startup
+18-Oct-2026 - Plot told of board changes, to keep its scrolling backbuffer up to date
+18-Oct-2026 - Rotation animation drawn from the board placements, with the player over it
+18-Oct-2026 - Minimap of the whole board shown or hidden with the M key
+18-Oct-2026 - Plot given the board itself, reading it through Board.get_region
 """
+import os
 import sys
 import pygame
 import numpy as np
@@ -13,6 +26,9 @@ from position import *
 from tiles import *
 from player import *
 from board import *
+from rng import *
+from connectivity import *
+from paths import *
 from plot import *
 from text import *
 
@@ -34,10 +50,16 @@ MOVE_KEYS = (pygame.K_UP, pygame.K_LEFT, pygame.K_DOWN, pygame.K_RIGHT)
 ROTATE_KEYS = (pygame.K_z, pygame.K_x)
 SLIDE_ROW_KEYS = (pygame.K_q, pygame.K_w)
 SLIDE_COLUMN_KEYS = (pygame.K_p, pygame.K_l)
+MINIMAP_KEY = pygame.K_m
 RANDOM = pygame.USEREVENT + 0
 
 pygame.time.set_timer(RANDOM, 3000)
 
+# Set up random numbers - set a seed to reproduce a game
+seed = None
+random_streams = RandomStreams(seed)
+event_rng = random_streams.get("events")
+
 # Create a tile set and fill tile bag
 test_tileset = False
 
@@ -59,20 +81,48 @@ else:
     tile_counts = {0: 40, 1: 140, 2: 80, 3: 80, 4: 20}
 
 tile_set = TileSet(doors_for_tiles, tile_counts, name=tileset_name)
-tile_bag = TileBag(tile_set)
+tile_bag = TileBag(tile_set, rng=random_streams.get("tile_bag"))
 tile_size = tile_set.tiles[0].size
 
 # Set (full) board dimensions in tiles using Position - must be an odd numbers
-# Create board and fill with tiles from tile bag
-board_dim = Dimensions(7, 7)
-board = Board(board_dim, tile_bag=tile_bag)
+# Create board and fill with tiles from tile bag,
+# or open a board saved with Board.save (memory-mapped)
+board_path = None
+
+if board_path:
+    board = Board.open(
+        board_path, door_table=tile_set.door_table, rng=random_streams.get("board")
+    )
+    board_dim = board.dim
+else:
+    board_dim = Dimensions(7, 7)
+    board = Board(
+        board_dim,
+        tile_bag=tile_bag,
+        door_table=tile_set.door_table,
+        rng=random_streams.get("board"),
+    )
+connectivity = Connectivity(board)
+path_finder = PathFinder(board)
 
 # Set (board) view dimensions in tiles using Position - must be an odd numbers
 # Set shift to centre view in the middle of the full boaes
 # Create display
 view_dim = Dimensions(5, 5)
 shift_pos = Position((board.w - view_dim.w) // 2, (board.h - view_dim.h) // 2)
-plot = Plot(view_dim, board.placements, tile_set.tiles, shift_pos=shift_pos)
+# Keep rendered tile images between runs, so they are not drawn again
+art_cache_dir = os.path.join(os.path.expanduser("~"), ".cache", "shifting_maze")
+plot = Plot(
+    view_dim,
+    board,
+    tile_set.tiles,
+    shift_pos=shift_pos,
+    art_cache_dir=art_cache_dir,
+)
+# Tell the plot of board changes, so it knows when to draw its backbuffer again
+board.add_listener(plot)
+# Minimap of the whole board, shown over the view with the M key
+minimap = Minimap(board, tile_set, scale=4)
 
 # Set player position to be in centre of the board
 # Create player and plot on board
@@ -88,6 +138,7 @@ plot.show_player(player)
 # Initialise text output
 text = Text()
 print()
+print(f"Seed: {random_streams.seed}")
 print(tile_set)
 print(board)
 print("Game Start")
@@ -109,10 +160,8 @@ while running:
 
             elif event.key in MOVE_KEYS:
 
-                tile = tile_set.tiles[
-                    board.placements[player.pos.y, player.pos.x, Board.TILE]
-                ]
-                rot = board.placements[player.pos.y, player.pos.x, Board.ROT]
+                tile_number, rot = board.get_placement(player.pos)
+                tile = tile_set.tiles[tile_number]
 
                 if event.key == pygame.K_UP:
                     dir = Position.UP
@@ -145,39 +194,51 @@ while running:
                 else:
                     if plot.is_centred_move(player.pos, dir):
                         print(f"Centred move - direction: {dir}")
-                        plot.move_player_centred(
-                            player, dir, board.placements, tile_set.tiles
-                        )
+                        plot.move_player_centred(player, dir, board, tile_set.tiles)
                     else:
                         print(f"Free move - direction: {dir}")
-                        plot.move_player_free(
-                            player, dir, board.placements, tile_set.tiles
-                        )
+                        plot.move_player_free(player, dir, board, tile_set.tiles)
                     player.pos.move(dir)
 
+            elif event.key == MINIMAP_KEY:
+                if plot.minimap is None:
+                    plot.show_minimap(minimap, player)
+                else:
+                    plot.hide_minimap(board, tile_set.tiles)
+
             elif event.key in ROTATE_KEYS:
                 if event.key == pygame.K_z:
                     rotation = 1
                 elif event.key == pygame.K_x:
                     rotation = -1
-                plot.rotate_tile(player.pos, rotation)
+                plot.rotate_tile(player.pos, rotation, board, tile_set.tiles, player)
                 board.rotate_tile(player.pos, rotation)
 
-            tile = tile_set.tiles[
-                board.placements[player.pos.y, player.pos.x, Board.TILE]
-            ]
-            rot = board.placements[player.pos.y, player.pos.x, Board.ROT]
+            tile_number, rot = board.get_placement(player.pos)
+            tile = tile_set.tiles[tile_number]
             doors = tile.doors
             print(f"Player pos: {player.pos}    Plot shift pos: {plot.shift_pos}")
-            print(f"Current tile: {tile.number} {doors}   rotation: {rot}\n")
+            print(f"Current tile: {tile.number} {doors}   rotation: {rot}")
+            reachable = connectivity.get_reachable(player.pos).sum()
+            print(f"Reachable rooms: {reachable}\n")
+
+        elif event.type == pygame.MOUSEBUTTONDOWN:
+            target_pos = plot.get_board_pos(
+                Position(*event.pos), shift_pos=plot.shift_pos
+            )
+            path = path_finder.get_path(player.pos, target_pos)
+            if path is None:
+                print(f"No path to room: {target_pos}\n")
+            else:
+                print(f"Path to room: {target_pos}   moves: {path}\n")
 
         elif event.type == RANDOM:
             print(f"Random Event")
-            random_event = random.choice([0])
+            random_event = event_rng.choice([0])
             if random_event == 0:
-                dir = random.choice(Position.DIRECTIONS)
+                dir = int(event_rng.choice(Position.DIRECTIONS))
                 if dir == Position.RIGHT or dir == Position.LEFT:
-                    row = random.choice(range(board.w))
+                    row = int(event_rng.integers(board.w))
                     # row not in view
                     if row < shift_pos.y or row > shift_pos.y + plot.view_h:
                         board.slide_row_free(col_or_row, dir, tile_bag)
@@ -194,7 +255,9 @@ while running:
                         plot.slide_row_centred()
 
                 if dir == Position.RIGHT or dir == Position.LEFT:
-                    row = random.choice(range(shift_pos.y, shift_pos.y + plot.view_h))
+                    row = int(
+                        event_rng.integers(shift_pos.y, shift_pos.y + plot.view_h)
+                    )
                     print("\Slide row")
                     print(f"row: {col_or_row}  dir: {dir}")
                     patch_placements = board.slide_row(col_or_row, dir, tile_bag)
@@ -203,8 +266,8 @@ while running:
                     else:
                         move_player = Player.DO_NOT_MOVE
                 elif dir == Position.UP or dir == Position.DOWN:
-                    col_or_row = random.choice(
-                        range(shift_pos.x, shift_pos.x + plot.view_w)
+                    col_or_row = int(
+                        event_rng.integers(shift_pos.x, shift_pos.x + plot.view_w)
                     )
                     print("Slide column")
                     print(f"col: {col_or_row}  dir: {dir}")
@@ -227,9 +290,7 @@ while running:
                 if move_player == Player.MOVE_WITH_TILES:
                     player.pos.move(dir)
                     dir_corr = (dir + 2) % 4
-                    plot.move_player_centred(
-                        player, dir_corr, board.placements, tile_set.tiles
-                    )
+                    plot.move_player_centred(player, dir_corr, board, tile_set.tiles)
                     plot.shift_pos.move(dir)
 
 pygame.quit()
@@ -0,0 +1,261 @@
+"""
+Minimap
+
+History
+18-Oct-2026 - Initial version - the whole board drawn at a few pixels per tile,
+              redrawing only the areas of the board that change
+18-Oct-2026 - Glyphs made from the door masks of the tile set's door table
+18-Oct-2026 - Listens to the board only while shown, redrawing the whole board when
+              it starts listening (so changes are not kept while hidden)
+"""
+import pygame
+import numpy as np
+
+from tiles import *
+from board import *
+from position import *
+
+
+class Minimap:
+    """
+    A small image of the whole board, a few pixels for each tile, so that the
+    whole of the maze can be seen (the plot only shows the view).
+
+    Each tile and rotation has a glyph made from a 3 x 3 pattern of the tile
+    (walls in the corners, the floor in the middle and a door or wall in the
+    middle of each edge), scaled down to the minimap scale by averaging.
+    While shown, the minimap listens to the board and redraws only the areas
+    that change, when it is next drawn. It does not listen while hidden, and
+    redraws the whole board when it starts listening again.
+
+    Attributes:
+        board : Board
+            board shown
+        scale : int
+            length of the side of a tile in pixels (1 to 4)
+        glyphs : numpy.array(t, 4, scale, scale, 3)
+            red, green and blue of each pixel (x then y) of the glyph
+            for each tile number (t) and rotation
+        image : pygame.Surface
+            image of the whole board
+        dirty_rects : list
+            areas of the board (pygame.Rect in tiles) changed since the image was drawn
+        view_colour : tuple
+            red, green, blue tuple for the outline of the view
+        player_colour : tuple
+            red, green, blue tuple for the player
+        listening : logical
+            True if listening to the board
+    """
+
+    def __init__(self, board, tile_set, scale=2):
+        """
+        Parameters:
+            board : Board
+                board to be shown
+            tile_set : TileSet
+                Set of tiles in play
+
+        Keywords:
+            scale : int
+                length of the side of a tile in pixels (1 to 4). Default: 2
+        """
+        self.board = board
+        self.scale = scale
+        self.glyphs = self.make_glyphs(tile_set, scale)
+        self.image = pygame.Surface((board.w * scale, board.h * scale), 0, 32)
+        self.dirty_rects = [pygame.Rect(0, 0, board.w, board.h)]
+        self.view_colour = (255, 255, 255)  # WHITE
+        self.player_colour = (100, 200, 100)  # GREEN
+        self.listening = False
+
+    @staticmethod
+    def make_glyphs(tile_set, scale):
+        """
+        Make the glyph for each tile number and rotation
+
+        Parameters:
+            tile_set : TileSet
+                Set of tiles in play
+            scale : int
+                length of the side of a glyph in pixels
+
+        Returns
+            glyphs : numpy.array(t, 4, scale, scale, 3)
+                red, green and blue of each pixel (x then y) of each glyph
+        """
+        masks = tile_set.door_table.masks
+        patterns = np.zeros(masks.shape + (3, 3, 3))
+        # x, y position in the pattern of the door in each direction
+        door_cells = {
+            Position.UP: (1, 0),
+            Position.LEFT: (0, 1),
+            Position.DOWN: (1, 2),
+            Position.RIGHT: (2, 1),
+        }
+        for number, tile in tile_set.tiles.items():
+            patterns[number, ...] = tile.wall_colour
+            patterns[number, :, 1, 1] = tile.floor_colour
+            for dir, (x, y) in door_cells.items():
+                doors = (masks[number] >> dir) & 1 == 1
+                patterns[number, doors, x, y] = tile.floor_colour
+
+        # scale by averaging each pixel over the part of the pattern it covers
+        patterns = patterns.repeat(scale, axis=2).repeat(scale, axis=3)
+        glyphs = patterns.reshape(masks.shape + (scale, 3, scale, 3, 3))
+        return np.rint(glyphs.mean(axis=(3, 5))).astype(np.uint8)
+
+    def start_listening(self):
+        """
+        Start listening to the board for changes, with the whole board to be
+        redrawn (as any changes while not listening are unknown)
+        """
+        if not self.listening:
+            self.board.add_listener(self)
+            self.listening = True
+        self.dirty_rects = [pygame.Rect(0, 0, self.board.w, self.board.h)]
+
+    def stop_listening(self):
+        """
+        Stop listening to the board for changes (e.g. while the minimap is hidden)
+        """
+        if self.listening:
+            self.board.remove_listener(self)
+            self.listening = False
+        self.dirty_rects = []
+
+    def board_changed(self, rect, edges_changed):
+        """
+        Board listener - note an area of the board to be redrawn
+
+        Parameters:
+            rect : pygame.Rect
+                area of board (in tiles) that has changed
+            edges_changed : logical
+                True if any doors have changed
+        """
+        self.dirty_rects.append(pygame.Rect(rect))
+
+    def update(self):
+        """
+        Redraw the areas of the image for the parts of the board that have changed
+        """
+        if not self.dirty_rects:
+            return
+        scale = self.scale
+        pixels = pygame.surfarray.pixels3d(self.image)
+        for rect in self.dirty_rects:
+            region = self.board.get_region(rect)
+            glyphs = self.glyphs[region[..., Board.TILE].T, region[..., Board.ROT].T]
+            pixels[
+                rect.left * scale : rect.right * scale,
+                rect.top * scale : rect.bottom * scale,
+            ] = glyphs.transpose(0, 2, 1, 3, 4).reshape(
+                rect.w * scale, rect.h * scale, 3
+            )
+        del pixels
+        self.dirty_rects = []
+
+    def draw(self, surface, plot_pos, view_rect=None, player_pos=None):
+        """
+        Draw the minimap, bringing it up to date first
+
+        Parameters:
+            surface : pygame.Surface
+                surface to draw on
+            plot_pos : Position
+                position in pixels (x, y) of the top left of the minimap
+
+        Keywords:
+            view_rect : pygame.Rect
+                area of board (in tiles) in view, outlined. Default is None, no outline
+            player_pos : Position
+                position of player on board, marked. Default is None, no player
+
+        Returns
+            rect : pygame.Rect
+                area of surface drawn on
+        """
+        self.update()
+        rect = surface.blit(self.image, plot_pos.coords())
+        scale = self.scale
+        if view_rect is not None:
+            pygame.draw.rect(
+                surface,
+                self.view_colour,
+                pygame.Rect(
+                    plot_pos.x + view_rect.x * scale,
+                    plot_pos.y + view_rect.y * scale,
+                    view_rect.w * scale,
+                    view_rect.h * scale,
+                ),
+                1,
+            )
+        if player_pos is not None:
+            surface.fill(
+                self.player_colour,
+                pygame.Rect(
+                    plot_pos.x + player_pos.x * scale,
+                    plot_pos.y + player_pos.y * scale,
+                    scale,
+                    scale,
+                ),
+            )
+        return rect
+
+
+#
+# Some tests in isolation
+#
+if __name__ == "__main__":
+    import time
+
+    print("START TESTING")
+
+    doors_for_tiles = {
+        0: [1, 1, 1, 1],
+        1: [0, 1, 1, 1],
+        2: [0, 0, 1, 1],
+        3: [0, 1, 0, 1],
+        4: [0, 0, 0, 1],
+    }
+    tile_counts = {0: 40000, 1: 140000, 2: 80000, 3: 80000, 4: 20000}
+    tile_set = TileSet(doors_for_tiles, tile_counts, name="standard")
+    tile_bag = TileBag(tile_set)
+    board = Board(
+        Dimensions(501, 501), tile_bag=tile_bag, door_table=tile_set.door_table
+    )
+
+    minimap = Minimap(board, tile_set, scale=1)
+    minimap.start_listening()
+    surface = pygame.Surface((800, 600), 0, 32)
+    start = time.perf_counter()
+    minimap.draw(surface, Position(0, 0))
+    print(f"First draw: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+    start = time.perf_counter()
+    frames = 100
+    for frame in range(frames):
+        board.slide_row(frame % board.h, Position.RIGHT, tile_bag)
+        minimap.draw(
+            surface,
+            Position(0, 0),
+            view_rect=pygame.Rect(248, 248, 5, 5),
+            player_pos=Position(250, 250),
+        )
+    elapsed = (time.perf_counter() - start) * 1000 / frames
+    print(f"Slide a row and draw: {elapsed:.3f} ms")
+
+    # nothing kept while not listening, and all redrawn on listening again
+    minimap.stop_listening()
+    for frame in range(frames):
+        board.slide_col(frame % board.w, Position.DOWN, tile_bag)
+    assert minimap.dirty_rects == [] and minimap not in board.listeners
+    minimap.start_listening()
+    minimap.draw(surface, Position(0, 0))
+    expected = Minimap(board, tile_set, scale=1)
+    expected.draw(surface, Position(0, 0))
+    assert pygame.image.tobytes(minimap.image, "RGB") == pygame.image.tobytes(
+        expected.image, "RGB"
+    )
+    print("Hidden minimap: no changes kept, redrawn in full when shown")
@@ -0,0 +1,210 @@
+"""
+Paths
+
+History
+18-Oct-2026 - Initial version - shortest paths through the maze from a distance field
+              kept until a change to the board affects it
+"""
+import numpy as np
+
+from board import *
+from position import *
+
+
+class PathFinder:
+    """
+    Finds shortest paths through the doors of the maze from a starting room
+    (e.g. the player position), by a breadth first search of the whole board.
+
+    The distances from the starting room are kept and reused until the starting room
+    changes or the doors change in an area of the board next to a room that can be
+    reached, as only then can the distances change.
+
+    Attributes:
+        board : Board
+            board being searched (must have a door table)
+        start : tuple
+            (x, y) coordinates of the starting room of the distances held
+            (None if no distances held)
+        distances : numpy.array(h, w)
+            number of moves to reach each room from the starting room
+            (-1 if it cannot be reached)
+        passages : numpy.array(h * w, 4)
+            True where movement is possible from each room (flat board index)
+            in each direction, as used for the distances held
+    """
+
+    def __init__(self, board):
+        """
+        Parameters:
+            board : Board
+                board to be searched (must have a door table)
+        """
+        self.board = board
+        self.start = None
+        self.distances = None
+        self.passages = None
+        self.steps = np.array(
+            [board.w * step_y + step_x for step_x, step_y in Position.STEPS]
+        )
+        board.add_listener(self)
+
+    def board_changed(self, rect, edges_changed):
+        """
+        Forget the distances held if a change to the board could affect them
+
+        Parameters:
+            rect : pygame.Rect
+                area of board (in tiles) that has changed
+            edges_changed : logical
+                True if any doors have changed
+        """
+        if not edges_changed or self.distances is None:
+            return
+        near_rect = rect.inflate(2, 2).clip(self.board.rect)
+        near_distances = self.distances[
+            near_rect.top : near_rect.bottom, near_rect.left : near_rect.right
+        ]
+        if (near_distances >= 0).any():
+            self.start = None
+            self.distances = None
+            self.passages = None
+
+    def get_distances(self, pos):
+        """
+        Get the number of moves to reach every room on the board from a room
+
+        Parameters:
+            pos : Position
+                x, y coordinates of starting room. (0, 0) = (left, top)
+
+        Returns
+            distances : numpy.array(h, w)
+                number of moves to reach each room (-1 if it cannot be reached)
+        """
+        if self.start == pos.coords():
+            return self.distances
+
+        passages = self.board.get_passages().reshape(self.board.size, 4)
+        distances = np.full(self.board.size, -1, dtype=np.int32)
+        frontier = np.array([pos.y * self.board.w + pos.x])
+        distance = 0
+        distances[frontier] = distance
+        while len(frontier):
+            distance += 1
+            next_rooms = []
+            for dir in Position.DIRECTIONS:
+                rooms = frontier[passages[frontier, dir]] + self.steps[dir]
+                next_rooms.append(rooms[distances[rooms] < 0])
+            frontier = np.unique(np.concatenate(next_rooms))
+            distances[frontier] = distance
+
+        self.start = pos.coords()
+        self.distances = distances.reshape(self.board.h, self.board.w)
+        self.passages = passages
+        return self.distances
+
+    def get_distance(self, pos, target_pos):
+        """
+        Get the number of moves to reach a room
+
+        Parameters:
+            pos : Position
+                x, y coordinates of starting room
+            target_pos : Position
+                x, y coordinates of room to be reached
+
+        Returns
+            distance : int
+                number of moves (-1 if it cannot be reached)
+        """
+        return self.get_distances(pos)[target_pos.y, target_pos.x]
+
+    def get_path(self, pos, target_pos):
+        """
+        Get a shortest path from a room to another
+
+        Parameters:
+            pos : Position
+                x, y coordinates of starting room
+            target_pos : Position
+                x, y coordinates of room to be reached
+
+        Returns
+            path : list
+                directions of each move (0 = up, 1 = left, 2 = down, 3 = right),
+                or None if the room cannot be reached
+        """
+        distances = self.get_distances(pos).ravel()
+        room = target_pos.y * self.board.w + target_pos.x
+        if distances[room] < 0:
+            return None
+
+        path = []
+        while distances[room] > 0:
+            for dir in Position.DIRECTIONS:
+                back_dir = (dir + 2) % 4
+                previous_room = room + self.steps[back_dir]
+                if (
+                    self.passages[room, back_dir]
+                    and distances[previous_room] == distances[room] - 1
+                ):
+                    path.append(dir)
+                    room = previous_room
+                    break
+        path.reverse()
+        return path
+
+    def get_next_move(self, pos, target_pos):
+        """
+        Get the direction of the first move on a shortest path to a room
+
+        Parameters:
+            pos : Position
+                x, y coordinates of starting room
+            target_pos : Position
+                x, y coordinates of room to be reached
+
+        Returns
+            dir : int
+                direction of move (0 = up, 1 = left, 2 = down, 3 = right),
+                or None if the room cannot be reached or is the starting room
+        """
+        path = self.get_path(pos, target_pos)
+        if not path:
+            return None
+        return path[0]
+
+
+#
+# Some tests in isolation
+#
+if __name__ == "__main__":
+    print("START TESTING")
+
+    # Create a tile set and board
+    doors_for_tiles = {
+        0: [1, 1, 1, 1],
+        1: [0, 1, 1, 1],
+        2: [0, 0, 1, 1],
+        3: [0, 1, 0, 1],
+        4: [0, 0, 0, 1],
+    }
+    tile_counts = {0: 40, 1: 140, 2: 80, 3: 80, 4: 20}
+    tile_set = TileSet(doors_for_tiles, tile_counts, name="standard")
+    tile_bag = TileBag(tile_set)
+    board = Board(Dimensions(7, 7), tile_bag=tile_bag, door_table=tile_set.door_table)
+    print(board)
+
+    path_finder = PathFinder(board)
+    pos = Position(3, 3)
+    print(f"Distances from {pos}:\n{path_finder.get_distances(pos)}")
+
+    target_pos = Position(0, 0)
+    print(f"Path to {target_pos}: {path_finder.get_path(pos, target_pos)}")
+
+    # Slide a row and check again
+    board.slide_row(3, Position.LEFT, tile_bag)
+    print(board)
+    print(f"Distances from {pos}:\n{path_finder.get_distances(pos)}")
+    print(f"Path to {target_pos}: {path_finder.get_path(pos, target_pos)}")
@@ -4,6 +4,8 @@ History
 
  17-Jul-2021 - Initial version
  21-Aug-2021 - Simplified variables and naming - more use of Position, noted as pos variables
+ 18-Oct-2026 - Player images drawn when first required
+ 18-Oct-2026 - Player size and offset scaled to the tile size, for zooming
 """
 import pygame
 from board import *
@@ -20,13 +22,19 @@ class Player:
         name: str
             name of player
         image: pygame.Surface
-            image of player avatar
+            image of player avatar, drawn when first required
+        background: pygame.Surface
+            image of floor behind player, drawn when first required
         rect: pygame.Rect
             rectangle for player image
         pos : Position
             x, y coordinates of tile placement. (0, 0) = (left, top)
         floor_colour : tuple
             Red, green, blue tuple for colour of floor.
+        size : int
+            diameter of player image in pixels (40 for the default 102 pixel tile)
+        tile_size : int
+            size of tile in pixels the player is drawn for
         player_offset : Position
             x,y coordinates of player offset from top left of tile in plot space. Default: Position(20,20)
     """
@@ -53,16 +61,44 @@ class Player:
         self.name = name
         self.colour = colour
         self.pos = pos
-        self.size = 40
-        self.image = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
-        self.rect = self.image.get_rect()
-        pygame.draw.ellipse(self.image, self.colour, self.rect)
+        self.floor_colour = tile.floor_colour
+        self.base_size = 40
+        self.base_tile_size = tile.size
+        self.set_tile_size(tile.size)
 
-        self.background = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
-        pygame.draw.ellipse(
-            self.background, tile.floor_colour, self.rect
-        )  # TODO: correct to set correct colour and use later
+    def set_tile_size(self, tile_size):
+        """
+        Scale the player to a tile size, keeping it in the same proportion
+        to the tile and centred in it (the images are drawn again when required)
+
+        Parameters:
+            tile_size : int
+                size of tile in pixels
+        """
+        self.tile_size = tile_size
+        self.size = max(1, round(self.base_size * tile_size / self.base_tile_size))
+        self.rect = pygame.Rect(0, 0, self.size, self.size)
+        self._image = None
+        self._background = None
         self.offset = Position(
-            int((tile.size - self.rect.w) / 2),
-            int((tile.size - self.rect.h) / 2),
+            int((tile_size - self.rect.w) / 2),
+            int((tile_size - self.rect.h) / 2),
         )
+
+    @property
+    def image(self):
+        """Image of player avatar, drawn when first required"""
+        if self._image is None:
+            self._image = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
+            pygame.draw.ellipse(self._image, self.colour, self.rect)
+        return self._image
+
+    @property
+    def background(self):
+        """Image of floor behind player, drawn when first required"""
+        if self._background is None:
+            self._background = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
+            pygame.draw.ellipse(
+                self._background, self.floor_colour, self.rect
+            )  # TODO: correct to set correct colour and use later
+        return self._background
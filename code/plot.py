@@ -4,9 +4,43 @@ Plot
 History
 17-Jul-2021 - Initial version
 16-Sep-2021 - Separation of concerns - updated to focus plot on key functionality
+18-Oct-2026 - Added conversion of plot position to board position
+18-Oct-2026 - Tiles drawn from the images made for each rotation rather than
+              rotating the tile image on every draw
+18-Oct-2026 - Restored get_extra_tiles as a separate method (was run at the end of
+              rotate_tile)
+18-Oct-2026 - Patches drawn from a single atlas of tile images with one Surface.blits call
+18-Oct-2026 - Added zoom, drawing tiles at any size from an atlas kept for each size
+18-Oct-2026 - Tile atlases can be kept in a cache directory, to save drawing them again
+18-Oct-2026 - Animations update only the areas of the display changed (dirty rectangles)
+              rather than flipping the whole display
+18-Oct-2026 - Animations take a set time with easing, driven by a clock, rather than
+              moving one pixel (or degree) per frame
+18-Oct-2026 - Centred moves scroll a backbuffer slightly larger than the view, drawing
+              only the row or column of tiles coming into view
+18-Oct-2026 - Rotation animation frames kept in a cache for each tile, rotation and
+              direction, so rotating is plain blits into a single area
+18-Oct-2026 - Drawing done on a render target, either the display window or an
+              offscreen surface (so a plot can be drawn without a display)
+18-Oct-2026 - Added an array engine for get_patch, making the patch pixels with a
+              numpy gather from the tile atlas pixels rather than blits
+18-Oct-2026 - Added a minimap of the whole board, drawn over the view when shown
+18-Oct-2026 - Zoom scales the player to the tile size
+18-Oct-2026 - Placements can be given as the board itself, read through
+              Board.get_region (e.g. for a ToroidalBoard, without copying the board)
+18-Oct-2026 - Rotation frame cache limited by the bytes of the frames held (rather
+              than the number of tiles), keeping only the angles drawn
+18-Oct-2026 - Minimap listens to the board only while shown
+18-Oct-2026 - Removed get_extra_tiles, unused since patches are drawn from the
+              tile atlas
+18-Oct-2026 - slide_tiles enabled again (its body was disabled as a string), drawn with
+              dirty rectangles and a timed animation
+18-Oct-2026 - Zoom keeps at least one tile in view when a tile is larger than the
+              window
 """
 import os
 import sys
+from collections import OrderedDict
 from numpy.core.fromnumeric import nonzero
 import pygame
 import numpy as np
@@ -16,6 +50,9 @@ from tiles import *
 from board import *
 from position import *
 from player import *
+from animation import *
+from render import *
+from minimap import *
 
 
 class Plot:
@@ -62,8 +99,10 @@ class Plot:
     Plot Attributes:
         These are in pixel coordinates relative to the top left corner of the display window
 
+        target : WindowTarget or OffscreenTarget
+            where the plot is drawn, the display window or an offscreen surface
         board : pygame.Surface
-            display window forming (board) view
+            surface of the render target forming (board) view
         tile_size : int
             dimension of (square) tiles in pixels
         plot_w : int
@@ -78,21 +117,78 @@ class Plot:
             default colour of tile ( (150, 150, 255) = BLUE )
         empty_tile : pygame.Surface
             tile sized surface with the default board colour
+        atlas : TileAtlas
+            single image of every tile in each rotation at the tile size,
+            used to draw patches
+        atlases : AtlasCache
+            tile atlases for the tile sizes (zoom levels) used recently
+        art_cache_dir : str
+            directory in which tile atlas images are kept (None if not kept)
+        dirty_rects : list
+            areas of the display window (pygame.Rect) changed since it was last updated
+        patch_engine : int
+            how get_patch makes patches: Plot.BLIT_ENGINE (Surface.blits from the
+            tile atlas) or Plot.ARRAY_ENGINE (numpy gather of the atlas pixels)
+        minimap : Minimap
+            minimap drawn over the top right of the view (None if not shown)
+        minimap_player : Player
+            player marked on the minimap (None if not marked)
+        backbuffer : pygame.Surface
+            tiles in view with a margin of one tile all round, scrolled for centred moves.
+            The view is at (tile_size, tile_size)
+        backbuffer_valid : logical
+            False if the tiles in view need to be drawn into the backbuffer again
+            (e.g. after a tile has been rotated or the board has changed)
+
+    Animation Attributes:
+        clock : pygame.time.Clock
+            clock used to time animation frames
+        max_fps : int
+            maximum number of animation frames per second (0 for no limit,
+            the default when drawing offscreen)
+        move_duration : int
+            time taken to move the player to the next tile in milliseconds
+        bounce_duration : int
+            time taken for the player to bounce off a wall and back in milliseconds
+        slide_duration : int
+            time taken to slide a row or column by a tile in milliseconds
+        rotate_duration : int
+            time taken to rotate a tile by 90 degrees in milliseconds
+        rotation_frames : OrderedDict
+            images of a tile part way through rotating, a dict indexed by the angles
+            drawn so far, for each (tile number, start rotation, direction, tile size),
+            most recently used last
+        rotation_frame_bytes : int
+            bytes of pixels held in rotation_frames
+        max_rotation_frame_bytes : int
+            maximum bytes of pixels held in rotation_frames, with the least recently
+            used entries dropped beyond this
     """
 
     FULLVIEW = 0
     VIEWROW = 1
     VIEWCOL = 2
 
-    def __init__(self, view_dim, placements, tiles, shift_pos=None):
+    BLIT_ENGINE = 0
+    ARRAY_ENGINE = 1
+
+    def __init__(
+        self,
+        view_dim,
+        placements,
+        tiles,
+        shift_pos=None,
+        art_cache_dir=None,
+        offscreen=False,
+    ):
         """
         Set-up view of board displaying tiles
 
         Parameters
             view_dim : Position
                 dimensions of (board) view in tiles (x, y)
-            placements : numpy.array(h, w, n)
-                holds all information on the state of the each square on the board.
+            placements : Board or numpy.array(h, w, n)
+                board, or all information on the state of the each square on the board.
                 h is the y dimension
                 w is the x dimension
                 n is the board square attribute
@@ -102,6 +198,12 @@ class Plot:
         Keywords:
             shift_pos : Position
                 x-y movement vector for viewing area relative to dimole board (in 'tile space')
+            art_cache_dir : str
+                directory in which tile atlas images are kept, so that they are
+                read rather than drawn the next time. Default is None, not kept
+            offscreen : logical
+                if True draw on an offscreen surface rather than opening a window,
+                e.g. for thumbnails, tests or bots. Default: False
         """
         self.view_dim = view_dim
         self.view_w = self.view_dim.w
@@ -109,9 +211,14 @@ class Plot:
         self.view_half_w = self.view_w // 2
         self.view_half_h = self.view_h // 2
 
-        self.board_h = placements.shape[0]
-        self.board_w = placements.shape[1]
-        self.n = placements.shape[2]
+        if hasattr(placements, "get_region"):
+            self.board_h = placements.h
+            self.board_w = placements.w
+            self.n = placements.n
+        else:
+            self.board_h = placements.shape[0]
+            self.board_w = placements.shape[1]
+            self.n = placements.shape[2]
         self.board_dim = Dimensions(self.board_w, self.board_h)
         self.board_half_w = self.board_w // 2
         self.board_half_h = self.board_h // 2
@@ -147,29 +254,234 @@ class Plot:
         self.empty_tile.fill(self.board_colour)
 
         # screen set-up
-        SCREEN_X_ORIGIN = 0
-        SCREEN_Y_ORIGIN = 0
-        SCREEN_WIDTH = self.plot_w
-        SCREEN_HEIGHT = self.plot_h
+        if offscreen:
+            self.target = OffscreenTarget((self.plot_w, self.plot_h))
+        else:
+            self.target = WindowTarget((self.plot_w, self.plot_h))
+
+        # display tiles, from an atlas of images in the display pixel format
+        self.board = self.target.surface
+        self.dirty_rects = []
+        self.patch_engine = Plot.BLIT_ENGINE
+        self.minimap = None
+        self.minimap_player = None
+
+        self.clock = pygame.time.Clock()
+        self.max_fps = 0 if offscreen else 60
+        self.move_duration = 250
+        self.bounce_duration = 250
+        self.slide_duration = 300
+        self.rotate_duration = 250
+        self.rotation_frames = OrderedDict()
+        self.rotation_frame_bytes = 0
+        self.max_rotation_frame_bytes = 16 * 1024 * 1024
+        self.art_cache_dir = art_cache_dir
+        self.atlases = AtlasCache(tiles, cache_dir=art_cache_dir)
+        self.atlas = self.atlases.get(self.tile_size)
+        self.make_backbuffer()
+        self.draw_patch(self.get_region(placements, self.get_view_rect()), tiles)
+        print(f"self.shift_pos: {self.shift_pos}")
+
+        self.target.flip()
+
+    def zoom(self, tile_size, placements, tiles, player=None):
+        """
+        Change the size the tiles are drawn at, keeping the window the same size,
+        so that more (or fewer) tiles are in view, and redraw the view.
+        The view stays centred on the same square where possible.
+
+        Parameters:
+            tile_size : int
+                dimension of (square) tiles in pixels
+            placements : Board or numpy.array(h, w, n)
+                board, or all information on the state of the each square of the board
+            tiles : TileSet.tiles
+                Tiles in use
 
-        os.environ["SDL_VIDEO_WINDOW_POS"] = (
-            str(SCREEN_X_ORIGIN) + "," + str(SCREEN_Y_ORIGIN)
+        Keywords:
+            player : Player
+                player to be scaled to the tile size and drawn again.
+                Default is None, no player
+        """
+        mid_x = self.shift_pos.x + self.view_half_w
+        mid_y = self.shift_pos.y + self.view_half_h
+
+        self.tile_size = tile_size
+        if tiles is not self.atlases.tiles:
+            self.atlases = AtlasCache(tiles, cache_dir=self.art_cache_dir)
+        self.atlas = self.atlases.get(tile_size)
+
+        # Odd numbers of tiles in view that fit in the window and on the board
+        # (at least one, even if a tile is larger than the window)
+        view_w = max(1, min(self.plot_w // tile_size, self.board_w))
+        view_h = max(1, min(self.plot_h // tile_size, self.board_h))
+        self.view_dim = Dimensions(view_w - 1 + view_w % 2, view_h - 1 + view_h % 2)
+        self.view_w = self.view_dim.w
+        self.view_h = self.view_dim.h
+        self.view_half_w = self.view_w // 2
+        self.view_half_h = self.view_h // 2
+        self.centred_move_rect = pygame.Rect(
+            self.view_half_w,
+            self.view_half_h,
+            self.board_w - self.view_w + 1,
+            self.board_h - self.view_h + 1,
+        )
+        self.shift_pos = Position(
+            min(max(mid_x - self.view_half_w, 0), self.board_w - self.view_w),
+            min(max(mid_y - self.view_half_h, 0), self.board_h - self.view_h),
         )
 
-        # display tiles
-        self.board = pygame.display.set_mode([SCREEN_WIDTH, SCREEN_HEIGHT])
-        patch_view_placements = np.empty([self.view_h, self.view_w, self.n], dtype=int)
-        patch_view_placements[...] = placements[
-            self.shift_pos.y : self.shift_pos.y + self.view_h,
-            self.shift_pos.x : self.shift_pos.x + self.view_h,
-            :,
-        ]
-        patch = self.get_patch(patch_view_placements, tiles)
-        print(f"self.shift_pos: {self.shift_pos}")
-        self.board.blit(patch, (0, 0))
+        self.empty_tile = pygame.Surface(
+            (self.tile_size, self.tile_size), pygame.SRCALPHA
+        )
+        self.empty_tile.fill(self.board_colour)
+        self.make_backbuffer()
+
+        self.board.fill(self.board_colour)
+        self.draw_patch(self.get_region(placements, self.get_view_rect()), tiles)
+        self.target.flip()
+        if player is not None:
+            player.set_tile_size(tile_size)
+            self.show_player(player)
+
+    def get_view_rect(self):
+        """
+        Get the area of the board in view
+
+        Returns
+            view_rect : pygame.Rect
+                area of board (in tiles) in view
+        """
+        return pygame.Rect(self.shift_pos.x, self.shift_pos.y, self.view_w, self.view_h)
+
+    def get_region(self, placements, rect):
+        """
+        Get the placements for an area of the board, either from the board itself
+        (through its get_region, e.g. so a ToroidalBoard is not copied) or by
+        slicing an array of placements
+
+        Parameters:
+            placements : Board or numpy.array(h, w, n)
+                board, or the placements of each square of the board
+            rect : pygame.Rect
+                area of board (in tiles), which must be on the board
+
+        Returns
+            region_placements : numpy.array(h, w, n)
+                placements of each square in the area
+        """
+        if hasattr(placements, "get_region"):
+            return placements.get_region(rect)
+        return placements[rect.top : rect.bottom, rect.left : rect.right]
+
+    def make_backbuffer(self):
+        """
+        Create the backbuffer for the view and tile size, in the display pixel format.
+        The tiles are drawn into it at the next centred move
+        """
+        self.backbuffer = pygame.Surface(
+            ((self.view_w + 2) * self.tile_size, (self.view_h + 2) * self.tile_size),
+            0,
+            self.board,
+        )
+        self.backbuffer_valid = False
+
+    def board_changed(self, rect, edges_changed):
+        """
+        Board listener - mark the backbuffer to be drawn again if a changed area of
+        the board is in it
+
+        Parameters:
+            rect : pygame.Rect
+                area of board (in tiles) that has changed
+            edges_changed : logical
+                True if any doors have changed
+        """
+        backbuffer_rect = pygame.Rect(
+            self.shift_pos.x - 1, self.shift_pos.y - 1, self.view_w + 2, self.view_h + 2
+        )
+        if backbuffer_rect.colliderect(rect):
+            self.backbuffer_valid = False
+
+    def mark_dirty(self, rect):
+        """
+        Note an area of the display window as changed, to be updated by update_display
+
+        Parameters:
+            rect : pygame.Rect
+                area changed (in pixels), e.g. as returned by pygame.Surface.blit
+        """
+        self.dirty_rects.append(pygame.Rect(rect))
+
+    def update_display(self):
+        """
+        Update the areas of the display window changed since it was last updated,
+        with the minimap (if shown) drawn over the top
+        """
+        if self.dirty_rects:
+            if self.minimap is not None:
+                self.draw_minimap()
+            self.target.update(self.dirty_rects)
+            self.dirty_rects = []
+
+    def show_minimap(self, minimap, player=None):
+        """
+        Show a minimap over the top right of the view, kept up to date as the
+        display is updated (the minimap listens to the board until hidden)
+
+        Parameters:
+            minimap : Minimap
+                minimap of the board
+
+        Keywords:
+            player : Player
+                player to be marked on the minimap. Default is None, not marked
+        """
+        self.minimap = minimap
+        self.minimap_player = player
+        minimap.start_listening()
+        self.draw_minimap()
+        self.target.update(self.dirty_rects)
+        self.dirty_rects = []
+
+    def hide_minimap(self, placements, tiles):
+        """
+        Stop showing the minimap, drawing the view again (with the player, if marked)
+
+        Parameters:
+            placements : Board or numpy.array(h, w, n)
+                board, or all information on the state of the each square of the board
+            tiles : TileSet.tiles
+                Tiles in use
+        """
+        player = self.minimap_player
+        self.minimap.stop_listening()
+        self.minimap = None
+        self.minimap_player = None
+        self.draw_patch(self.get_region(placements, self.get_view_rect()), tiles)
+        self.mark_dirty(pygame.Rect(0, 0, self.plot_w, self.plot_h))
+        if player is not None:
+            self.show_player(player)
+        else:
+            self.update_display()
 
-        pygame.display.flip()
-        pygame.display.set_caption("Shifting Maze")
+    def draw_minimap(self):
+        """
+        Draw the minimap over the top right of the view, outlining the view
+        """
+        margin = 10
+        plot_pos = Position(
+            max(self.plot_w - self.minimap.image.get_width() - margin, 0), margin
+        )
+        view_rect = self.get_view_rect()
+        player_pos = None
+        if self.minimap_player is not None:
+            player_pos = self.minimap_player.pos
+        self.mark_dirty(
+            self.minimap.draw(
+                self.board, plot_pos, view_rect=view_rect, player_pos=player_pos
+            )
+        )
 
     def sign(self, x):
         """
@@ -213,6 +525,30 @@ class Plot:
         )
         return plot_pos
 
+    def get_board_pos(self, plot_pos, shift_pos=None):
+        """
+        Take plot position and convert to tile (full) board position
+
+        Parameters:
+            plot_pos : Position
+                image position in pixels (x, y)
+
+        Keywords:
+            shift_pos : Position
+                (x, y) offset in (full) board coordinates to be applied
+
+        Returns
+            board_pos : Position
+                (full) board position in tiles (x, y)
+        """
+        if shift_pos is None:
+            shift_pos = Position(0, 0)
+        board_pos = Position(
+            plot_pos.x // self.tile_size + shift_pos.x,
+            plot_pos.y // self.tile_size + shift_pos.y,
+        )
+        return board_pos
+
     def is_centred_move(self, player_pos, dir):
         """
         Move player in direction specified, deciding dimether to keep centred of freely move
@@ -278,7 +614,9 @@ class Plot:
         x = plot_pos.x + player.offset.x
         y = plot_pos.y + player.offset.y
 
-        background_tile = pygame.transform.rotate(tile.image, rot * 90)
+        background_tile = self.atlas.image.subsurface(
+            self.atlas.get_rect(tile.number, rot)
+        )
 
         if dir == Position.UP:
             distance = player.offset.y
@@ -290,10 +628,16 @@ class Plot:
             distance = self.tile_size - player.size - player.offset.x
 
         if not next:
-            distance -= tile.wall_width
+            distance -= tile.wall_width * self.tile_size // tile.size
 
-        for move in range(0, distance):
-            self.board.blit(background_tile, plot_pos.coords())
+        bounce_out = Animation(
+            self.bounce_duration // 2,
+            ease_out,
+            max_fps=self.max_fps,
+            clock=self.clock,
+        )
+        for move in bounce_out.steps(distance):
+            self.mark_dirty(self.board.blit(background_tile, plot_pos.coords()))
             if dir == Position.DOWN:
                 self.board.blit(player.image, (x, y + move))
             elif dir == Position.UP:
@@ -302,10 +646,14 @@ class Plot:
                 self.board.blit(player.image, (x + move, y))
             elif dir == Position.LEFT:
                 self.board.blit(player.image, (x - move, y))
-            pygame.display.flip()
+            self.update_display()
 
-        for move in range(distance, 0, -1):
-            self.board.blit(background_tile, plot_pos.coords())
+        bounce_back = Animation(
+            self.bounce_duration // 2, max_fps=self.max_fps, clock=self.clock
+        )
+        for move_back in bounce_back.steps(distance):
+            move = distance - move_back
+            self.mark_dirty(self.board.blit(background_tile, plot_pos.coords()))
             if dir == Position.DOWN:
                 self.board.blit(player.image, (x, y + move))
             elif dir == Position.UP:
@@ -315,7 +663,7 @@ class Plot:
             elif dir == Position.LEFT:
                 self.board.blit(player.image, (x - move, y))
 
-            pygame.display.flip()
+            self.update_display()
 
     def move_player_centred(self, player, player_dir, placements, tiles):
         """
@@ -328,54 +676,57 @@ class Plot:
             player_dir : int
                 direction in which player is moving
                 0 = UP, 1 = LEFT, 2 = DOWN, 3 = RIGHT
-            placements : numpy.array(h, w, n)
-                holds all information on the state of the each square of the board
+            placements : Board or numpy.array(h, w, n)
+                board, or all information on the state of the each square of the board
             tiles : TileSet.tiles
                 Tiles in use
         """
-        dir = (player_dir + 2) % 4
-        if dir == Position.RIGHT:
-            patch_placements = np.empty(
-                [self.view_h, self.board_w + 1, self.n], dtype=int
-            )
-            patch_placements[:, 1:, :] = placements[
-                self.shift_pos.y : self.shift_pos.y + self.view_h, ...
-            ]
-            row_or_col = self.shift_pos.y
-        elif dir == Position.LEFT:
-            patch_placements = np.empty(
-                [self.view_h, self.board_w + 1, self.n], dtype=int
-            )
-            patch_placements[:, : self.board_w, :] = placements[
-                self.shift_pos.y : self.shift_pos.y + self.view_h, ...
-            ]
-            row_or_col = self.shift_pos.y
-        elif dir == Position.DOWN:
-            patch_placements = np.empty(
-                [self.board_h + 1, self.view_w, self.n], dtype=int
-            )
-            patch_placements[1:, ...] = placements[
-                :, self.shift_pos.x : self.shift_pos.x + self.view_w, :
-            ]
-            row_or_col = self.shift_pos.x
-        elif dir == Position.UP:
-            patch_placements = np.empty(
-                [self.board_h + 1, self.view_w, self.n], dtype=int
+        view_x = self.shift_pos.x
+        view_y = self.shift_pos.y
+        if not self.backbuffer_valid:
+            self.draw_patch(
+                self.get_region(placements, self.get_view_rect()),
+                tiles,
+                plot_pos=Position(self.tile_size, self.tile_size),
+                surface=self.backbuffer,
             )
-            patch_placements[: self.board_h, ...] = placements[
-                :, self.shift_pos.x : self.shift_pos.x + self.view_w, :
-            ]
-            row_or_col = self.shift_pos.x
-
-        self.slide_tiles(
-            patch_placements,
-            dir,
-            row_or_col,
+            self.backbuffer_valid = True
+
+        # draw only the row or column coming into view, in the backbuffer margin
+        step = Position(0, 0).get_next(player_dir)
+        if player_dir == Position.RIGHT or player_dir == Position.LEFT:
+            x = view_x + self.view_half_w + step.x * (self.view_half_w + 1)
+            line_rect = pygame.Rect(x, view_y, 1, self.view_h)
+            line_pos = Position((x - view_x + 1) * self.tile_size, self.tile_size)
+        else:
+            y = view_y + self.view_half_h + step.y * (self.view_half_h + 1)
+            line_rect = pygame.Rect(view_x, y, self.view_w, 1)
+            line_pos = Position(self.tile_size, (y - view_y + 1) * self.tile_size)
+        self.draw_patch(
+            self.get_region(placements, line_rect),
             tiles,
-            player,
-            move_player=Player.STAY_AS_TILES_MOVE,
+            plot_pos=line_pos,
+            surface=self.backbuffer,
+        )
+
+        plot_pos = self.get_plot_pos(player.pos, shift_pos=self.shift_pos)
+        player_x = plot_pos.x + player.offset.x
+        player_y = plot_pos.y + player.offset.y
+        view_rect = pygame.Rect(
+            self.tile_size, self.tile_size, self.plot_w, self.plot_h
         )
 
+        animation = Animation(
+            self.move_duration, max_fps=self.max_fps, clock=self.clock
+        )
+        for move in animation.steps(self.tile_size):
+            area = view_rect.move(step.x * move, step.y * move)
+            self.mark_dirty(self.board.blit(self.backbuffer, (0, 0), area))
+            self.board.blit(player.image, (player_x, player_y))
+            self.update_display()
+
+        # bring the view back to the same place in the backbuffer
+        self.backbuffer.scroll(-step.x * self.tile_size, -step.y * self.tile_size)
         self.shift_pos.move(player_dir)
 
     def move_player_free(self, player, dir, placements, tiles):
@@ -388,8 +739,8 @@ class Plot:
             dir : int
                 direction in which player is moving
                 0 = UP, 1 = LEFT, 2 = DOWN, 3 = RIGHT
-            placements : numpy.array(h, w, n)
-                holds all information on the state of the each square of the board
+            placements : Board or numpy.array(h, w, n)
+                board, or all information on the state of the each square of the board
             tiles : TileSet.tiles
                 Tiles in use
         """
@@ -399,43 +750,39 @@ class Plot:
         player_y = plot_pos.y + player.offset.y
 
         if dir == Position.RIGHT:
-            patch_placements = np.empty([1, 2, self.n], dtype=int)
-            patch_placements[...] = placements[
-                player.pos.y : player.pos.y + 1, player.pos.x : player.pos.x + 2, :
-            ]
+            patch_rect = pygame.Rect(player.pos.x, player.pos.y, 2, 1)
         elif dir == Position.LEFT:
-            patch_placements = np.empty([1, 2, self.n], dtype=int)
-            patch_placements[...] = placements[
-                player.pos.y : player.pos.y + 1, player.pos.x - 1 : player.pos.x + 1, :
-            ]
+            patch_rect = pygame.Rect(player.pos.x - 1, player.pos.y, 2, 1)
         elif dir == Position.DOWN:
-            patch_placements = np.empty([2, 1, self.n], dtype=int)
-            patch_placements[...] = placements[
-                player.pos.y : player.pos.y + 2, player.pos.x : player.pos.x + 1, :
-            ]
+            patch_rect = pygame.Rect(player.pos.x, player.pos.y, 1, 2)
         elif dir == Position.UP:
-            patch_placements = np.empty([2, 1, self.n], dtype=int)
-            patch_placements[...] = placements[
-                player.pos.y - 1 : player.pos.y + 1, player.pos.x : player.pos.x + 1, :
-            ]
+            patch_rect = pygame.Rect(player.pos.x, player.pos.y - 1, 1, 2)
 
-        patch = self.get_patch(patch_placements, tiles)
+        patch = self.get_patch(self.get_region(placements, patch_rect), tiles)
 
-        for move in range(0, self.tile_size + 1):
+        animation = Animation(
+            self.move_duration, max_fps=self.max_fps, clock=self.clock
+        )
+        for move in animation.steps(self.tile_size):
             if dir == Position.DOWN:
-                self.board.blit(patch, (plot_pos.x, plot_pos.y))
+                patch_rect = self.board.blit(patch, (plot_pos.x, plot_pos.y))
                 self.board.blit(player.image, (player_x, player_y + move))
             elif dir == Position.UP:
-                self.board.blit(patch, (plot_pos.x, plot_pos.y - self.tile_size))
+                patch_rect = self.board.blit(
+                    patch, (plot_pos.x, plot_pos.y - self.tile_size)
+                )
                 self.board.blit(player.image, (player_x, player_y - move))
             elif dir == Position.RIGHT:
-                self.board.blit(patch, (plot_pos.x, plot_pos.y))
+                patch_rect = self.board.blit(patch, (plot_pos.x, plot_pos.y))
                 self.board.blit(player.image, (player_x + move, player_y))
             elif dir == Position.LEFT:
-                self.board.blit(patch, (plot_pos.x - self.tile_size, plot_pos.y))
+                patch_rect = self.board.blit(
+                    patch, (plot_pos.x - self.tile_size, plot_pos.y)
+                )
                 self.board.blit(player.image, (player_x - move, player_y))
 
-            pygame.display.flip()
+            self.mark_dirty(patch_rect)
+            self.update_display()
 
     def slide_tiles(
         self,
@@ -471,20 +818,11 @@ class Plot:
                 1 = MOVE_WITH_TILES - player is plotted on patch and moved with it
                 2 = STAY_AS_TILES_MOVE - player stays still as tiles move beneath
         """
-        """
         patch_h = patch_placements.shape[0]
         patch_w = patch_placements.shape[1]
         patch_n = patch_placements.shape[2]
 
-        if player_move_type == Player.STAY_WITH_LINE_OF_TILES:
-            player_plot_tile = self.get_plot_pos(player.pos, shift_pos=self.shift_pos)
-            if dir == Position.RIGHT or dir == Position.LEFT:
-                fixed_line_view = pygame.Surface((self.plot_w, self.tile_size), pygame.SRCALPHA)
-                fixed_line_view.blit(self.board, (0.0), (0, player_plot_tile.y, self.plot_w, self.tile_size))
-            elif dir == Position.UP or dir == Position.DOWN:
-                fixed_line_view = pygame.Surface((self.tile_size, self.plot_h), pygame.SRCALPHA)
-                fixed_line_view.blit(self.board, (0.0), (player_plot_tile.x, 0, self.tile_size, self.plot_h)
-        elif (
+        if (
             player_move_type == Player.MOVE_WITH_TILES
             or player_move_type == Player.STAY_AS_TILES_MOVE
         ):
@@ -533,7 +871,10 @@ class Plot:
         delta_plot_y = 0
 
         # Slide the patch, overplotting the player if required
-        for move in range(self.tile_size + 1):
+        animation = Animation(
+            self.slide_duration, max_fps=self.max_fps, clock=self.clock
+        )
+        for move in animation.steps(self.tile_size):
             if dir == Position.RIGHT:
                 delta_plot_x = move
             elif dir == Position.LEFT:
@@ -542,7 +883,11 @@ class Plot:
                 delta_plot_y = move
             elif dir == Position.UP:
                 delta_plot_y = -move
-            self.board.blit(patch, (plot_x + delta_plot_x, plot_y + delta_plot_y))
+            patch_rect = self.board.blit(
+                patch, (plot_x + delta_plot_x, plot_y + delta_plot_y)
+            )
+            # the patch moves, so update where it was as well as where it is
+            self.mark_dirty(patch_rect.inflate(2, 2))
             if player_move_type == Player.MOVE_WITH_TILES:
                 self.board.blit(
                     player.image,
@@ -554,11 +899,58 @@ class Plot:
             elif player_move_type == Player.STAY_AS_TILES_MOVE:
                 self.board.blit(player.image, player_plot_pos.coords())
 
-            pygame.display.flip()
-            pygame.time.delay(5)
+            self.update_display()
+
+    def get_rotation_frame(self, tile_number, rot, rotation, angle):
         """
+        Get the image of a tile part way through rotating, from the cache of
+        rotation frames (drawing it if it has not been used before, and dropping
+        the least recently used tile rotations if the cache is then too large)
+
+        Parameters:
+            tile_number : int
+                number of tile
+            rot : int
+                rotation of tile before rotating
+            rotation : int
+                direction of rotation. +1 = anticlockwise, -1 = clockwise
+            angle : int
+                angle rotated so far in degrees (0 to 90)
 
-    def rotate_tile(self, board_pos, rotation):
+        Returns
+            frame : pygame.Surface
+                image of the rotated tile, larger than the tile part way through
+        """
+        key = (tile_number, rot, rotation, self.tile_size)
+        frames = self.rotation_frames.get(key)
+        if frames is None:
+            frames = {}
+            self.rotation_frames[key] = frames
+        else:
+            self.rotation_frames.move_to_end(key)
+
+        frame = frames.get(angle)
+        if frame is None:
+            # rotate a copy with alpha, so the corners uncovered are transparent
+            image = pygame.Surface((self.tile_size, self.tile_size), pygame.SRCALPHA)
+            image.blit(self.atlas.image, (0, 0), self.atlas.get_rect(tile_number, rot))
+            frame = pygame.transform.rotate(image, rotation * angle)
+            if pygame.display.get_surface() is not None:
+                frame = frame.convert_alpha()
+            frames[angle] = frame
+            self.rotation_frame_bytes += frame.get_pitch() * frame.get_height()
+            while (
+                self.rotation_frame_bytes > self.max_rotation_frame_bytes
+                and len(self.rotation_frames) > 1
+            ):
+                old_key, old_frames = self.rotation_frames.popitem(last=False)
+                for old_frame in old_frames.values():
+                    self.rotation_frame_bytes -= (
+                        old_frame.get_pitch() * old_frame.get_height()
+                    )
+        return frame
+
+    def rotate_tile(self, board_pos, rotation, placements, tiles, player=None):
         """
         Plot tile in position with orientation
 
@@ -568,138 +960,49 @@ class Plot:
             rotation : int
                 rotation to be applied to tile. Either +1 or -1.
                 +1 = 90 degrees anticlockwise. -1 = 90 degrees clockwise
+            placements : Board or numpy.array(h, w, n)
+                board, or all information on the state of the each square of the board
+                (before the tile is rotated)
+            tiles : TileSet.tiles
+                Tiles in use
+
+        Keywords:
+            player : Player
+                player to be drawn over the tile. Default is None, no player
         """
         print(f"Action: Rotate tile   rotation: {rotation}")
 
-        start_angle = 0
-        end_angle = rotation * 90
-        angle_inc = self.sign(end_angle - start_angle)
-        end_angle += angle_inc
-
         plot_pos = self.get_plot_pos(board_pos, shift_pos=self.shift_pos)
         if not plot_pos:
             return
+        self.backbuffer_valid = False
 
-        # extract tile from the board
-        tile_rect = pygame.Rect(plot_pos.x, plot_pos.y, self.tile_size, self.tile_size)
-        image = pygame.Surface(tile_rect.size, pygame.SRCALPHA)
-        image.blit(self.board, (0, 0), tile_rect)
-        image_rect = image.get_rect()
-
-        left_row_rect = pygame.Rect(
-            0, plot_pos.y, plot_pos.x + self.tile_size, self.tile_size
-        )
-        left_row = pygame.Surface(left_row_rect.size)
-        left_row.blit(self.board, (0, 0), left_row_rect)
-        left_row.blit(self.empty_tile, (plot_pos.x, 0))
-
-        right_row_rect = pygame.Rect(
-            plot_pos.x,
-            plot_pos.y,
-            self.plot_w - plot_pos.x + self.tile_size,
-            self.tile_size,
-        )
-        right_row = pygame.Surface(right_row_rect.size)
-        right_row.blit(self.board, (0, 0), right_row_rect)
-        right_row.blit(self.empty_tile, (0, 0))
-
-        top_column_rect = pygame.Rect(
-            plot_pos.x, 0, self.tile_size, plot_pos.y + self.tile_size
-        )
-        top_column = pygame.Surface(top_column_rect.size)
-        top_column.blit(self.board, (0, 0), top_column_rect)
-        top_column.blit(self.empty_tile, (0, plot_pos.y))
-
-        bottom_column_rect = pygame.Rect(
-            plot_pos.x,
-            plot_pos.y,
-            self.tile_size,
-            self.plot_h - plot_pos.y + self.tile_size,
-        )
-        bottom_column = pygame.Surface(bottom_column_rect.size)
-        bottom_column.blit(self.board, (0, 0), bottom_column_rect)
-        bottom_column.blit(self.empty_tile, (0, 0))
-
-        for angle in range(start_angle, end_angle, angle_inc):
-
-            rotated_image = pygame.transform.rotate(image, angle)
-            rotated_image_rect = rotated_image.get_rect()
-
-            rotate_adjust_x = (rotated_image_rect.right - image_rect.right) / 2
-            rotate_adjust_y = (rotated_image_rect.bottom - image_rect.bottom) / 2
-
-            self.board.blit(
-                left_row, (left_row_rect.left - rotate_adjust_x, left_row_rect.top)
-            )
-            self.board.blit(
-                right_row, (right_row_rect.left + rotate_adjust_x, right_row_rect.top)
-            )
-            self.board.blit(
-                top_column,
-                (top_column_rect.left, top_column_rect.top - rotate_adjust_y),
-            )
-            self.board.blit(
-                bottom_column,
-                (bottom_column_rect.left, bottom_column_rect.top + rotate_adjust_y),
-            )
-            self.board.blit(
-                rotated_image,
-                (plot_pos.x - rotate_adjust_x, plot_pos.y - rotate_adjust_y),
-            )
-
-            pygame.display.flip()
-            pygame.time.delay(5)
+        self.use_tiles(tiles)
+        tile_number, rot = self.get_region(
+            placements, pygame.Rect(board_pos.x, board_pos.y, 1, 1)
+        )[0, 0, [Board.TILE, Board.ROT]]
 
-        """
-        Plot tile in position with orientation
+        # the tile sticks out by up to (sqrt(2) - 1) / 2 of the tile size as it rotates
+        tile_rect = pygame.Rect(plot_pos.x, plot_pos.y, self.tile_size, self.tile_size)
+        spread = self.tile_size // 4
+        rect = tile_rect.inflate(2 * spread, 2 * spread).clip(self.board.get_rect())
+        background = self.board.subsurface(rect).copy()
+        background.blit(self.empty_tile, (tile_rect.x - rect.x, tile_rect.y - rect.y))
 
-        Parameters:
-            placements : numpy.array(width, height)
-                Tile number at each position of the board
-            orientations : numpy.array(width, height)
-                Orientation of tile at each position on the board.
-                0 = no rotation, 1 = 90 degrees rotation anticlockwise
-                2 = 180 degrees rotation, 3 = 90 degrees rotation clockwise
-            tiles : TileSet.tiles
-                Tiles in use
-            row_selection : int
-                If not None then indicates y coordinate of row to be returned
-                (e.g. -1 for row above (board) view, self.view_h for row below board)
-            column_selection : int
-                If not None then indicates x coordinate of column to be returned
-                (e.g. -1 for column to left of (board) view, self.view_w for column to right of board)
+        if player is not None:
+            player_pos = (plot_pos.x + player.offset.x, plot_pos.y + player.offset.y)
 
-        Returns
-            extra_tiles : pygame.Surface
-                Image of row or column with the required tile images
-        """
-        row_length = 1
-        column_length = 1
-        if row_selection is not None:
-            row_length = self.view_w
-            column_selection = 0
-        elif column_selection is not None:
-            column_length = self.view_h
-            row_selection = 0
-
-        extra_tiles = pygame.Surface(
-            (row_length * self.tile_size, column_length * self.tile_size),
-            pygame.SRCALPHA,
+        animation = Animation(
+            self.rotate_duration, max_fps=self.max_fps, clock=self.clock
         )
-
-        for x in range(row_length):
-            for y in range(column_length):
-                board_x = x + self.shift_pos.x + column_selection
-                board_y = y + self.shift_pos.y + row_selection
-                number = placements[board_y, board_x]
-                image = tiles[number].image
-                orientation = orientations[board_y, board_x]
-                rotated_image = pygame.transform.rotate(image, orientation * 90)
-                extra_tiles.blit(
-                    rotated_image, (x * self.tile_size, y * self.tile_size)
-                )
-
-        return extra_tiles
+        for angle in animation.steps(90):
+            frame = self.get_rotation_frame(tile_number, rot, rotation, angle)
+            self.board.blit(background, rect)
+            self.board.blit(frame, frame.get_rect(center=tile_rect.center))
+            if player is not None:
+                self.board.blit(player.image, player_pos)
+            self.mark_dirty(rect)
+            self.update_display()
 
     def show_player(self, player):
         """
@@ -717,8 +1020,8 @@ class Plot:
         background_rect = pygame.Rect(x, y, player.size, player.size)
         player.background.blit(self.board, (0, 0), background_rect)
 
-        self.board.blit(player.image, (x, y))
-        pygame.display.flip()
+        self.mark_dirty(self.board.blit(player.image, (x, y)))
+        self.update_display()
 
     """
     def slide_row_free()
@@ -886,20 +1189,57 @@ class Plot:
         h = placements.shape[0]
         w = placements.shape[1]
 
+        if self.patch_engine == Plot.ARRAY_ENGINE:
+            self.use_tiles(tiles)
+            patch = pygame.Surface((w * self.tile_size, h * self.tile_size), 0, 32)
+            pygame.surfarray.blit_array(patch, self.atlas.compose(placements))
+            return patch
+
         patch = pygame.Surface(
             (w * self.tile_size, h * self.tile_size), pygame.SRCALPHA
         )
 
-        for y in range(h):
-            for x in range(w):
-                plot_pos = self.get_plot_pos(Position(x, y))
-                tile_image = tiles[placements[y, x, Board.TILE]].image
-                rotated_tile_image = pygame.transform.rotate(
-                    tile_image, placements[y, x, Board.ROT] * 90
-                )
-                patch.blit(rotated_tile_image, plot_pos.coords())
+        self.draw_patch(placements, tiles, surface=patch)
         return patch
 
+    def use_tiles(self, tiles):
+        """
+        Change to the atlas for a set of tiles, if not the tiles in use
+
+        Parameters:
+            tiles : TileSet.tiles
+                Tiles in use
+        """
+        if tiles is not self.atlas.tiles:
+            self.atlases = AtlasCache(tiles, cache_dir=self.art_cache_dir)
+            self.atlas = self.atlases.get(self.tile_size)
+
+    def draw_patch(self, placements, tiles, plot_pos=None, surface=None):
+        """
+        Draw a patch of tiles straight onto a surface (by default the display),
+        with a single blits call from the tile atlas
+
+        Parameters:
+            placements : numpy.array(h, w, n)
+                holds all information on the state of the each square for patch
+            tiles : TileSet.tiles
+                Tiles in use
+
+        Keywords:
+            plot_pos : Position
+                position in pixels (x, y) of the top left of the patch. Default: (0, 0)
+            surface : pygame.Surface
+                surface to draw on. Default is None, the display window
+        """
+        self.use_tiles(tiles)
+        if plot_pos is None:
+            plot_pos = Position(0, 0)
+        if surface is None:
+            surface = self.board
+        surface.blits(
+            self.atlas.get_blits(placements, plot_pos.x, plot_pos.y), doreturn=False
+        )
+
 
 # ===============================
 # Some tests in isolation
@@ -974,6 +1314,56 @@ if __name__ == "__main__":
     player = Player(player_name, player_number, player_colour, player_pos, start_tile)
     plot.show_player(player)
 
+    # Test zooming - the player is scaled and centred in its tile
+    for tile_size in (34, 102):
+        plot.zoom(tile_size, board.placements, tile_set.tiles, player=player)
+        plot_pos = plot.get_plot_pos(player.pos, shift_pos=plot.shift_pos)
+        centre = (plot_pos.x + tile_size // 2, plot_pos.y + tile_size // 2)
+        assert player.size == round(40 * tile_size / 102)
+        assert player.offset.x + player.size <= tile_size
+        assert plot.board.get_at(centre)[:3] == player_colour
+        reach = player.size // 2 + 2
+        for corner in ((-1, -1), (1, -1), (-1, 1), (1, 1)):
+            outside = (centre[0] + corner[0] * reach, centre[1] + corner[1] * reach)
+            assert plot.board.get_at(outside)[:3] != player_colour
+        print(f"Zoom {tile_size}: player size {player.size} offset {player.offset}")
+
+    # Test sliding a row and a column in view, drawn offscreen - the last frame
+    # shows the line after the slide
+    slide_plot = Plot(
+        view_dim, board, tile_set.tiles, shift_pos=shift_pos, offscreen=True
+    )
+    view_rect = slide_plot.get_view_rect()
+    for dir, line in ((Position.RIGHT, view_rect.top), (Position.UP, view_rect.left)):
+        if dir == Position.RIGHT:
+            patch_placements = board.slide_row(line, dir, tile_bag)
+            line_rect = pygame.Rect(view_rect.left, line, view_rect.w, 1)
+        else:
+            patch_placements = board.slide_col(line, dir, tile_bag)
+            line_rect = pygame.Rect(line, view_rect.top, 1, view_rect.h)
+        slide_plot.slide_tiles(patch_placements, dir, line, tile_set.tiles)
+        plot_pos = slide_plot.get_plot_pos(
+            Position(line_rect.x, line_rect.y), shift_pos=slide_plot.shift_pos
+        )
+        expected = OffscreenTarget(slide_plot.board.get_size())
+        slide_plot.draw_patch(
+            slide_plot.get_region(board, line_rect),
+            tile_set.tiles,
+            plot_pos=plot_pos,
+            surface=expected.surface,
+        )
+        x, y = plot_pos.coords()
+        w, h = line_rect.w * tile_size, line_rect.h * tile_size
+        frame = slide_plot.target.get_frame()[x : x + w, y : y + h]
+        assert np.array_equal(frame, expected.get_frame()[x : x + w, y : y + h])
+        print(f"Slide {dir} of line {line}: last frame matches the board")
+
+    # Test zooming to tiles larger than the window - one tile still in view
+    plot.zoom(max(plot.plot_w, plot.plot_h) + 1, board.placements, tile_set.tiles)
+    assert plot.view_dim.w == 1 and plot.view_dim.h == 1
+    plot.zoom(tile_size, board.placements, tile_set.tiles, player=player)
+    assert plot.view_dim.w == view_dim.w and plot.view_dim.h == view_dim.h
+
     #
     # Start Testing
     # print tile set and board set-up for reference
@@ -3,6 +3,7 @@ Position
 
 History
  24-Jul-2021 - Initial version separated from board.py
+ 18-Oct-2026 - Added STEPS to give the (x, y) change for each direction
 """
 
 
@@ -22,6 +23,7 @@ class Position:
     LEFT = 1
     DOWN = 2
     RIGHT = 3
+    STEPS = [(0, -1), (-1, 0), (0, 1), (1, 0)]
 
     def __init__(self, x, y):
         """
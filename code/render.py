@@ -0,0 +1,126 @@
+"""
+Render targets
+
+History
+18-Oct-2026 - Initial version - plots drawn either to a window or to an offscreen
+              surface (no display needed), read as a NumPy array
+"""
+import os
+import pygame
+
+
+class WindowTarget:
+    """
+    Render target drawing to the display window
+
+    Attributes:
+        surface : pygame.Surface
+            display surface drawn on
+    """
+
+    def __init__(self, size, caption="Shifting Maze", window_pos=(0, 0)):
+        """
+        Open the display window
+
+        Parameters:
+            size : tuple
+                width and height of window in pixels
+
+        Keywords:
+            caption : str
+                window title. Default: "Shifting Maze"
+            window_pos : tuple
+                x, y position of the window on the screen in pixels. Default: (0, 0)
+        """
+        os.environ["SDL_VIDEO_WINDOW_POS"] = f"{window_pos[0]},{window_pos[1]}"
+        self.surface = pygame.display.set_mode(size)
+        pygame.display.set_caption(caption)
+
+    def update(self, rects):
+        """
+        Show changed areas of the surface in the window
+
+        Parameters:
+            rects : list
+                areas (pygame.Rect) changed
+        """
+        pygame.display.update(rects)
+
+    def flip(self):
+        """
+        Show the whole surface in the window
+        """
+        pygame.display.flip()
+
+
+class OffscreenTarget:
+    """
+    Render target drawing to a surface in memory, so no display (or X server)
+    is needed and nothing has to be copied to the screen. The frame drawn can be
+    read as a NumPy array without copying.
+
+    Attributes:
+        surface : pygame.Surface
+            surface drawn on (32 bits per pixel)
+    """
+
+    def __init__(self, size):
+        """
+        Parameters:
+            size : tuple
+                width and height of surface in pixels
+        """
+        self.surface = pygame.Surface(size, 0, 32)
+
+    def update(self, rects):
+        """
+        Nothing to show (the surface is the frame)
+
+        Parameters:
+            rects : list
+                areas (pygame.Rect) changed
+        """
+        pass
+
+    def flip(self):
+        """
+        Nothing to show (the surface is the frame)
+        """
+        pass
+
+    def get_pixels(self):
+        """
+        Get the pixels of the frame, referring to the surface (not copied).
+        The surface is locked while the array exists, so it must be deleted
+        before anything else is drawn.
+
+        Returns
+            pixels : numpy.array(w, h, 3)
+                red, green and blue of each pixel, indexed by x then y
+        """
+        return pygame.surfarray.pixels3d(self.surface)
+
+    def get_frame(self):
+        """
+        Get a copy of the pixels of the frame, e.g. to keep for later
+
+        Returns
+            frame : numpy.array(w, h, 3)
+                red, green and blue of each pixel, indexed by x then y
+        """
+        return pygame.surfarray.array3d(self.surface)
+
+
+#
+# Some tests in isolation
+#
+if __name__ == "__main__":
+    print("START TESTING")
+
+    target = OffscreenTarget((60, 40))
+    target.surface.fill((150, 150, 255))
+    target.surface.fill((0, 0, 0), pygame.Rect(10, 10, 20, 20))
+    pixels = target.get_pixels()
+    print(f"shape: {pixels.shape}  (0, 0): {pixels[0, 0]}  (15, 15): {pixels[15, 15]}")
+    del pixels
+    target.update([pygame.Rect(10, 10, 20, 20)])
@@ -0,0 +1,93 @@
+"""
+Random number streams
+
+History
+18-Oct-2026 - Initial version - named random number streams all derived from one seed,
+              so that a game can be reproduced exactly
+"""
+import zlib
+import numpy as np
+
+
+class RandomStreams:
+    """
+    Separate random number generators for each part of the Shifting Maze game
+    (e.g. "tile_bag", "board", "events"), all derived from a single seed.
+
+    The generator for a name depends only on the seed and the name, not on which
+    other generators have been used or in what order, so a part of the game can
+    be changed without changing the random numbers used by the other parts.
+
+    Attributes:
+        seed : int
+            seed from which all the generators are derived
+        streams : dict
+            generator (numpy.random.Generator) for each name used
+    """
+
+    def __init__(self, seed=None):
+        """
+        Keywords:
+            seed : int
+                seed from which all the generators are derived.
+                Default is None, in which case a seed is chosen at random
+                (and can be read from the seed attribute to reproduce the game)
+        """
+        if seed is None:
+            seed = np.random.SeedSequence().entropy
+        self.seed = seed
+        self.streams = {}
+
+    def get(self, name):
+        """
+        Get the random number generator for a part of the game
+
+        Parameters:
+            name : str
+                name of the part of the game, e.g. "board"
+
+        Returns
+            rng : numpy.random.Generator
+                random number generator for the name
+        """
+        rng = self.streams.get(name)
+        if rng is None:
+            key = zlib.crc32(name.encode())
+            rng = np.random.default_rng(np.random.SeedSequence([self.seed, key]))
+            self.streams[name] = rng
+        return rng
+
+    def spawn(self, count):
+        """
+        Create independent sets of streams, e.g. for simulations run in parallel
+
+        Parameters:
+            count : int
+                number of sets of streams
+
+        Returns
+            random_streams : list
+                RandomStreams for each set, each with its own seed derived from this seed
+        """
+        seeds = np.random.SeedSequence(self.seed).generate_state(count)
+        return [RandomStreams(int(seed)) for seed in seeds]
+
+
+#
+# Some tests in isolation
+#
+if __name__ == "__main__":
+    print("START TESTING")
+
+    random_streams = RandomStreams(1234)
+    print(f"seed: {random_streams.seed}")
+    print(f"board: {random_streams.get('board').integers(4, size=10)}")
+    print(f"events: {random_streams.get('events').integers(4, size=10)}")
+
+    # Same seed gives the same numbers, whatever order the streams are used in
+    random_streams = RandomStreams(1234)
+    print(f"events: {random_streams.get('events').integers(4, size=10)}")
+    print(f"board: {random_streams.get('board').integers(4, size=10)}")
+
+    for child_streams in random_streams.spawn(2):
+        print(f"child seed: {child_streams.seed}")
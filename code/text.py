@@ -3,6 +3,7 @@ Provide text output as game info and for debugging
 
 History
 30-Aug-2021 - Initial version
+18-Oct-2026 - Player tile read with Board.get_placement (was indexed x, y)
 """
 from board import *
 
@@ -20,8 +21,7 @@ class Text:
 
     def player_state(self, player, plot, board, tile_set):
         """ """
-        tiles = board.placements[player.pos.x, player.pos.y, Board.TILE]
-        rots = board.placements[player.pos.x, player.pos.y, Board.ROT]
+        tiles, rots = board.get_placement(player.pos)
         doors = tile_set.tiles[tiles].doors
 
         print(f"Player pos: {player.pos}    Plot shift pos: {plot.shift_pos}")
@@ -4,9 +4,38 @@ History
 
 17-Jul-2021 - Initial version-controlled code for tile generation and management. 
  Note: walls now changes to access with opposite truth values.
+18-Oct-2026 - Added DoorTable to precompute door masks for each tile and rotation
+18-Oct-2026 - Added TileBag.return_tiles to return a number of tiles with one shuffle
+18-Oct-2026 - Added TileSet.get_definition and from_definition for saving with a board
+18-Oct-2026 - TileBag holds the number of each tile left rather than a shuffled list,
+              so drawing and returning tiles needs no shuffle
+18-Oct-2026 - TileBag draws from a random number generator given to it
+18-Oct-2026 - Added TileSource, an endless source of tiles drawn by the alias method
+18-Oct-2026 - Tile images for all four rotations made once and kept,
+              converted to the display pixel format
+18-Oct-2026 - Added TileAtlas, a single image of every tile in each rotation, so that
+              a patch of tiles can be drawn with one Surface.blits call
+18-Oct-2026 - Tile image drawn when first required rather than when the tile is created
+18-Oct-2026 - Tile images can be drawn at any size, with AtlasCache keeping a tile atlas
+              for each size in use
+18-Oct-2026 - Tile atlases can be kept in a cache directory as raw pixels,
+              keyed on the tile definitions and size, to save drawing them again
+18-Oct-2026 - Added TileAtlas.pixels and compose, to make the pixels of a patch of
+              tiles with numpy indexing rather than blits
+18-Oct-2026 - Tile atlas cache is best effort: a bad cache file is drawn again and
+              replaced, and a cache directory that cannot be written is ignored.
+              The cache key includes Tile.IMAGE_VERSION
+18-Oct-2026 - Removed Tile.get_image and make_rotated_images (and TileSet's), unused
+              since tiles are drawn from a TileAtlas
+18-Oct-2026 - Removed DoorTable.get_masks, has_door and can_pass, as the masks and
+              passable tables are indexed directly
 """
-import random
+import os
+import json
+import hashlib
+from collections import OrderedDict
 import pygame
+import numpy as np
 
 
 class Tile:
@@ -28,7 +57,8 @@ class Tile:
         door_width : int
             Width of doorways. Default: 50
         image : pygame.Surface
-            Image of tile
+            Image of tile, drawn when first required, so that tiles can be used
+            without drawing anything (e.g. for simulations)
         rect : pygame.Surface.rect
             Rectangle describing tile image
         frame_colour : tuple
@@ -42,6 +72,10 @@ class Tile:
             Default: (150, 150, 255) # BLUE
     """
 
+    # Version of the drawing of tile images (draw_image), part of the key of
+    # images kept in a cache, so increase it whenever the drawing changes
+    IMAGE_VERSION = 1
+
     def __init__(self, number, doors=[1, 1, 1, 1]):
         """
         Parameters:
@@ -58,66 +92,103 @@ class Tile:
         self.frame = 1
         self.wall_width = 10
         self.door_width = 50
-
-        self.image = pygame.Surface((self.size, self.size), pygame.SRCALPHA)
+        self.rect = pygame.Rect(0, 0, self.size, self.size)
 
         self.frame_colour = (192, 192, 192)  # LIGHT_GREY
-        self.rect = self.image.get_rect()
-        self.image.fill(self.frame_colour)
-
         self.wall_colour = (200, 100, 100)  # RED
-        self.full_rect = (
-            self.frame,
-            self.frame,
-            self.size - 2 * self.frame,
-            self.size - 2 * self.frame,
-        )
-        pygame.draw.rect(self.image, self.wall_colour, self.full_rect)
-
         self.floor_colour = (150, 150, 255)  # BLUE
-        self.floor_rect = (
-            self.frame + self.wall_width,
-            self.frame + self.wall_width,
-            self.size - 2 * (self.frame + self.wall_width),
-            self.size - 2 * (self.frame + self.wall_width),
+
+        self._image = None
+
+    def get_definition(self):
+        """
+        Get the definition of the tile, i.e. everything that affects its image
+
+        Returns
+            definition : dict
+                number, doors, sizes and colours of the tile
+        """
+        return {
+            "number": self.number,
+            "doors": list(self.doors),
+            "size": self.size,
+            "frame": self.frame,
+            "wall_width": self.wall_width,
+            "door_width": self.door_width,
+            "frame_colour": list(self.frame_colour),
+            "wall_colour": list(self.wall_colour),
+            "floor_colour": list(self.floor_colour),
+        }
+
+    @property
+    def image(self):
+        """Image of tile, drawn when first required"""
+        if self._image is None:
+            self._image = self.draw_image()
+        return self._image
+
+    def draw_image(self, size=None):
+        """
+        Draw the image of the tile
+
+        Keywords:
+            size : int
+                length of one edge of the image in pixels, with the frame, walls
+                and doors scaled to match. Default is None, the size of the tile
+
+        Returns
+            image : pygame.Surface
+                image of tile
+        """
+        if size is None:
+            size = self.size
+        scale = size / self.size
+        frame = max(1, round(self.frame * scale))
+        wall_width = max(1, round(self.wall_width * scale))
+        door_width = max(1, round(self.door_width * scale))
+
+        image = pygame.Surface((size, size), pygame.SRCALPHA)
+        image.fill(self.frame_colour)
+
+        full_rect = (frame, frame, size - 2 * frame, size - 2 * frame)
+        pygame.draw.rect(image, self.wall_colour, full_rect)
+
+        floor_rect = (
+            frame + wall_width,
+            frame + wall_width,
+            size - 2 * (frame + wall_width),
+            size - 2 * (frame + wall_width),
         )
-        pygame.draw.rect(self.image, self.floor_colour, self.floor_rect)
-
-        if doors[0]:
-            self.top_door_rect = (
-                int((self.size - self.door_width) / 2),
-                self.frame,
-                self.door_width,
-                self.wall_width,
-            )
-            pygame.draw.rect(self.image, self.floor_colour, self.top_door_rect)
-
-        if doors[1]:
-            self.left_door_rect = (
-                self.frame,
-                int((self.size - self.door_width) / 2),
-                self.wall_width,
-                self.door_width,
-            )
-            pygame.draw.rect(self.image, self.floor_colour, self.left_door_rect)
-
-        if doors[2]:
-            self.bottom_door_rect = (
-                int((self.size - self.door_width) / 2),
-                self.size - self.wall_width - self.frame,
-                self.door_width,
-                self.wall_width,
+        pygame.draw.rect(image, self.floor_colour, floor_rect)
+
+        door_start = int((size - door_width) / 2)
+        if self.doors[0]:
+            top_door_rect = (door_start, frame, door_width, wall_width)
+            pygame.draw.rect(image, self.floor_colour, top_door_rect)
+
+        if self.doors[1]:
+            left_door_rect = (frame, door_start, wall_width, door_width)
+            pygame.draw.rect(image, self.floor_colour, left_door_rect)
+
+        if self.doors[2]:
+            bottom_door_rect = (
+                door_start,
+                size - wall_width - frame,
+                door_width,
+                wall_width,
             )
-            pygame.draw.rect(self.image, self.floor_colour, self.bottom_door_rect)
-
-        if doors[3]:
-            self.right_door_rect = (
-                self.size - self.wall_width - self.frame,
-                int((self.size - self.door_width) / 2),
-                self.wall_width,
-                self.door_width,
+            pygame.draw.rect(image, self.floor_colour, bottom_door_rect)
+
+        if self.doors[3]:
+            right_door_rect = (
+                size - wall_width - frame,
+                door_start,
+                wall_width,
+                door_width,
             )
-            pygame.draw.rect(self.image, self.floor_colour, self.right_door_rect)
+            pygame.draw.rect(image, self.floor_colour, right_door_rect)
+
+        return image
 
 
 class TileSet:
@@ -131,6 +202,8 @@ class TileSet:
             Dictionary of tiles indexed by the tile number.
         tile_counts : int
             Number of each tile in set.
+        door_table : DoorTable
+            Precomputed door masks for every tile and rotation in the set.
     """
 
     def __init__(self, doors_for_tiles, tile_counts, name="standard"):
@@ -151,6 +224,7 @@ class TileSet:
         self.tiles = {}
         for tile_number, doors in doors_for_tiles.items():
             self.tiles[tile_number] = Tile(tile_number, doors)
+        self.door_table = DoorTable(self)
 
     def __str__(self):
         """Print set of tiles"""
@@ -159,30 +233,417 @@ class TileSet:
             string += f" {number}:{self.tiles[number].doors}\n"
         return string
 
+    def get_definition(self):
+        """
+        Get the definition of the tile set, e.g. for saving with a board
+
+        Returns
+            definition : dict
+                name, doors_for_tiles and tile_counts of the tile set
+        """
+        return {
+            "name": self.name,
+            "doors_for_tiles": {
+                tile_number: list(tile.doors)
+                for tile_number, tile in self.tiles.items()
+            },
+            "tile_counts": dict(self.tile_counts),
+        }
+
+    @classmethod
+    def from_definition(cls, definition):
+        """
+        Create a tile set from its definition (as from get_definition,
+        also allowing tile numbers given as strings, as read from JSON)
+
+        Parameters
+            definition : dict
+                name, doors_for_tiles and tile_counts of the tile set
+
+        Returns
+            tile_set : TileSet
+                new tile set
+        """
+        doors_for_tiles = {
+            int(tile_number): doors
+            for tile_number, doors in definition["doors_for_tiles"].items()
+        }
+        tile_counts = {
+            int(tile_number): count
+            for tile_number, count in definition["tile_counts"].items()
+        }
+        return cls(doors_for_tiles, tile_counts, name=definition["name"])
+
+
+class DoorTable:
+    """
+    Precomputed look-up tables of the doors for every tile in a tile set and every rotation,
+    so that checking for a door or a passage is an array index rather than a calculation.
+
+    Door masks hold one bit per direction on the screen (after rotation):
+    bit 0 = up, bit 1 = left, bit 2 = down, bit 3 = right (as Position.DIRECTIONS).
+
+    Attributes
+        masks : numpy.array(t, 4)
+            Door mask for each tile number (t) and rotation (4), as uint8
+        passable : numpy.array(16, 16, 4)
+            True if movement is possible from a tile with the first door mask
+            to the adjacent tile with the second door mask in the direction given
+    """
+
+    def __init__(self, tile_set):
+        """
+        Parameters
+            tile_set : TileSet
+                Set of tiles in play for a game of the Shifting Maze.
+        """
+        numbers = list(tile_set.tiles.keys())
+        self.masks = np.zeros([max(numbers) + 1, 4], dtype=np.uint8)
+        for number in numbers:
+            doors = tile_set.tiles[number].doors
+            for rot in range(4):
+                mask = 0
+                for dir in range(4):
+                    if doors[(dir - rot) % 4]:
+                        mask |= 1 << dir
+                self.masks[number, rot] = mask
+
+        all_masks = np.arange(16, dtype=np.uint8)
+        self.passable = np.zeros([16, 16, 4], dtype=bool)
+        for dir in range(4):
+            door_out = (all_masks >> dir) & 1
+            door_in = (all_masks >> ((dir + 2) % 4)) & 1
+            self.passable[:, :, dir] = np.outer(door_out, door_in).astype(bool)
+
+
+class TileAtlas:
+    """
+    A single image holding every tile in each rotation, one row of four rotations
+    for each tile, so that a patch of tiles can be drawn with a single
+    pygame.Surface.blits call, with the positions worked out using numpy.
+    The tiles are opaque, so the atlas is held without per-pixel alpha
+    (in the display pixel format, if set up) and the blits are plain copies.
+
+    Attributes
+        tiles : dict
+            Tiles in the atlas, indexed by the tile number (TileSet.tiles)
+        size : int
+            Length of one edge of a square tile in pixels
+        image : pygame.Surface
+            Image of all the tiles (4 * size wide, one row of size for each tile number)
+        cache_path : str
+            File the image is kept in (None if not kept)
+        pixels : numpy.array(rows, 4, size, size, 3)
+            Red, green and blue of each pixel (x then y) of each tile number
+            and rotation, made from the image when first required
+    """
+
+    def __init__(self, tiles, size=None, cache_dir=None):
+        """
+        Parameters
+            tiles : dict
+                Tiles in use, indexed by the tile number (TileSet.tiles)
+
+        Keywords
+            size : int
+                Length of one edge of a square tile in pixels, with the tiles drawn
+                at this size (e.g. for zooming). Default is None, the size of the tiles
+            cache_dir : str
+                Directory in which the image is kept as raw pixels, read from there
+                if already made for the same tiles and size, rather than drawn.
+                Default is None, always draw
+        """
+        self.tiles = tiles
+        tile_size = next(iter(tiles.values())).size
+        self.size = size if size is not None else tile_size
+        rows = max(tiles) + 1
+        image_size = (4 * self.size, rows * self.size)
+        self._pixels = None
+
+        self.cache_path = None
+        if cache_dir is not None:
+            self.cache_path = os.path.join(cache_dir, f"atlas_{self.get_key()}.rgba")
+            image = self.read_cache(image_size)
+            if image is not None:
+                self.image = image
+                self.convert()
+                return
+
+        self.image = pygame.Surface(image_size, pygame.SRCALPHA)
+        for tile_number, tile in tiles.items():
+            if self.size == tile_size:
+                image = tile.image
+            else:
+                image = tile.draw_image(self.size)
+            for rot in range(4):
+                self.image.blit(
+                    pygame.transform.rotate(image, rot * 90),
+                    (rot * self.size, tile_number * self.size),
+                )
+
+        if self.cache_path is not None:
+            self.write_cache()
+        self.convert()
+
+    def read_cache(self, image_size):
+        """
+        Read the image from the cache file, if there is a good one.
+        A file that cannot be read as an image of the right size is deleted.
+
+        Parameters
+            image_size : tuple
+                width and height of the image in pixels
+
+        Returns
+            image : pygame.Surface
+                image read, or None if not read
+        """
+        try:
+            with open(self.cache_path, "rb") as cache_file:
+                pixels = bytearray(cache_file.read())
+            return pygame.image.frombuffer(pixels, image_size, "RGBA")
+        except FileNotFoundError:
+            return None
+        except (ValueError, OSError):
+            try:
+                os.remove(self.cache_path)
+            except OSError:
+                pass
+            return None
+
+    def write_cache(self):
+        """
+        Write the image to the cache file (via a temporary file, so that the file is
+        never seen half written). Nothing is written if the cache directory cannot
+        be written to.
+        """
+        temp_path = self.cache_path + f".{os.getpid()}"
+        try:
+            os.makedirs(os.path.dirname(self.cache_path), exist_ok=True)
+            with open(temp_path, "wb") as cache_file:
+                cache_file.write(pygame.image.tobytes(self.image, "RGBA"))
+            os.replace(temp_path, self.cache_path)
+        except OSError:
+            try:
+                os.remove(temp_path)
+            except OSError:
+                pass
+
+    def get_key(self):
+        """
+        Get a key for the image, which changes if anything affecting the image changes
+
+        Returns
+            key : str
+                hash of the version of the tile drawing, the definitions of the tiles
+                and the size
+        """
+        definition = {
+            "image_version": Tile.IMAGE_VERSION,
+            "size": self.size,
+            "tiles": [
+                self.tiles[number].get_definition() for number in sorted(self.tiles)
+            ],
+        }
+        return hashlib.sha1(
+            json.dumps(definition, sort_keys=True).encode()
+        ).hexdigest()[:16]
+
+    def convert(self):
+        """Convert the image to the pixel format of the display, if set up"""
+        if pygame.display.get_surface() is not None:
+            self.image = self.image.convert()
+
+    def get_rect(self, tile_number, rot=0):
+        """
+        Get the area of the atlas holding a tile with a rotation
+
+        Parameters
+            tile_number : int
+                Number of tile
+            rot : int
+                Rotation of tile
+
+        Returns
+            rect : pygame.Rect
+                Area of atlas image
+        """
+        return pygame.Rect(
+            rot * self.size, tile_number * self.size, self.size, self.size
+        )
+
+    @property
+    def pixels(self):
+        """Pixels of each tile number and rotation, made when first required"""
+        if self._pixels is None:
+            rows = self.image.get_height() // self.size
+            pixels = pygame.surfarray.array3d(self.image)
+            self._pixels = np.ascontiguousarray(
+                pixels.reshape(4, self.size, rows, self.size, 3).transpose(
+                    2, 0, 1, 3, 4
+                )
+            )
+        return self._pixels
+
+    def compose(self, placements):
+        """
+        Make the pixels of a patch of tiles with a single numpy gather,
+        e.g. for pygame.surfarray.blit_array or to use without a display
+
+        Parameters
+            placements : numpy.array(h, w, n)
+                tile number (index 0) and rotation (index 1) of each square of the patch
+
+        Returns
+            pixels : numpy.array(w * size, h * size, 3)
+                red, green and blue of each pixel of the patch, indexed by x then y
+        """
+        placements = np.asarray(placements)
+        h, w = placements.shape[:2]
+        patch = self.pixels[placements[..., 0].T, placements[..., 1].T]
+        return patch.transpose(0, 2, 1, 3, 4).reshape(w * self.size, h * self.size, 3)
+
+    def get_blits(self, placements, x=0, y=0):
+        """
+        Get the blits to draw a patch of tiles, for pygame.Surface.blits
+
+        Parameters
+            placements : numpy.array(h, w, n)
+                tile number (index 0) and rotation (index 1) of each square of the patch
+
+        Keywords
+            x : int
+                x position in pixels of the left of the patch. Default: 0
+            y : int
+                y position in pixels of the top of the patch. Default: 0
+
+        Returns
+            blits : list
+                (atlas image, destination position, atlas area) for each tile
+        """
+        placements = np.asarray(placements)
+        h, w = placements.shape[:2]
+        dest_y, dest_x = np.mgrid[
+            y : y + h * self.size : self.size, x : x + w * self.size : self.size
+        ]
+        areas = np.empty([h, w, 4], dtype=int)
+        areas[..., 0] = placements[..., 1] * self.size
+        areas[..., 1] = placements[..., 0] * self.size
+        areas[..., 2:] = self.size
+        dests = np.stack([dest_x, dest_y], axis=-1).reshape(-1, 2).tolist()
+        image = self.image
+        return [
+            (image, dest, area)
+            for dest, area in zip(dests, areas.reshape(-1, 4).tolist())
+        ]
+
+
+class AtlasCache:
+    """
+    Tile atlases for each tile size in use (e.g. zoom levels), each made when first
+    required, keeping only the most recently used ones.
+
+    Attributes
+        tiles : dict
+            Tiles in use, indexed by the tile number (TileSet.tiles)
+        max_atlases : int
+            Maximum number of atlases kept
+        cache_dir : str
+            Directory in which atlas images are kept (None if not kept)
+        atlases : OrderedDict
+            TileAtlas for each tile size, in order of use (least recently used first)
+    """
+
+    def __init__(self, tiles, max_atlases=4, cache_dir=None):
+        """
+        Parameters
+            tiles : dict
+                Tiles in use, indexed by the tile number (TileSet.tiles)
+
+        Keywords
+            max_atlases : int
+                Maximum number of atlases kept. Default: 4
+            cache_dir : str
+                Directory in which atlas images are kept (see TileAtlas).
+                Default is None, always draw
+        """
+        self.tiles = tiles
+        self.max_atlases = max_atlases
+        self.cache_dir = cache_dir
+        self.atlases = OrderedDict()
+
+    def get(self, size):
+        """
+        Get the atlas for a tile size, making it if required
+
+        Parameters
+            size : int
+                Length of one edge of a square tile in pixels
+
+        Returns
+            atlas : TileAtlas
+                Atlas of the tiles at the size
+        """
+        atlas = self.atlases.get(size)
+        if atlas is None:
+            atlas = TileAtlas(self.tiles, size, cache_dir=self.cache_dir)
+            self.atlases[size] = atlas
+            while len(self.atlases) > self.max_atlases:
+                self.atlases.popitem(last=False)
+        else:
+            self.atlases.move_to_end(size)
+        return atlas
+
 
 class TileBag:
     """
     Represents the bag of tiles from which random ones can be drawn for the Shifting Maze game.
 
+    The bag holds the number of each tile left in it, rather than a shuffled list of tiles.
+    A tile is drawn by choosing a tile in proportion to the numbers left, which gives
+    the same chances as drawing from a shuffled bag, so there is no need to shuffle
+    the bag when tiles are returned.
+
     Attributes
-        tile_numbers : list
-            List of the tiles in the bag in a random order
+        tile_types : numpy.array
+            Numbers of the different tiles in the set (in order)
+        counts : numpy.array
+            Number of each tile left in the bag
+        total : int
+            Number of tiles left in the bag
+        rng : numpy.random.Generator
+            Random number generator used to draw tiles
     """
 
-    def __init__(self, tile_set):
+    def __init__(self, tile_set, rng=None):
         """
         Parameters
             tile_set : TileSet
                 Set of tiles in play for a game of the Shifting Maze.
+
+        Keywords
+            rng : numpy.random.Generator
+                Random number generator used to draw tiles
+                (e.g. RandomStreams.get("tile_bag")). Default is None, a new generator
         """
-        self.tile_numbers = []
-        for tile_number, tile_count in tile_set.tile_counts.items():
-            self.tile_numbers += [tile_number] * tile_count
-        self.mix()
+        self.tile_types = np.array(sorted(tile_set.tile_counts), dtype=int)
+        self.counts = np.array(
+            [tile_set.tile_counts[tile_number] for tile_number in self.tile_types],
+            dtype=np.int64,
+        )
+        self.total = int(self.counts.sum())
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    @property
+    def tile_numbers(self):
+        """List of the tiles in the bag (in tile number order, not the order drawn)"""
+        return list(np.repeat(self.tile_types, self.counts))
 
     def mix(self):
-        """Mix the content of the bag"""
-        random.shuffle(self.tile_numbers)
+        """
+        Mix the content of the bag.
+        Nothing to do, as tiles are drawn at random from the numbers of each tile left.
+        """
 
     def draw_tile(self):
         """
@@ -195,7 +656,13 @@ class TileBag:
             tile_number : int
                 Number of tile drawn
         """
-        return self.tile_numbers.pop()
+        if self.total <= 0:
+            raise IndexError("draw from empty tile bag")
+        choice = self.rng.integers(self.total)
+        index = int(np.searchsorted(np.cumsum(self.counts), choice, side="right"))
+        self.counts[index] -= 1
+        self.total -= 1
+        return int(self.tile_types[index])
 
     def draw_tiles(self, number=1):
         """
@@ -206,24 +673,45 @@ class TileBag:
                 Number of tiles to be drawn. Default = 1
 
         Returns
-            tile_list : list
-                List of the tiles
+            tile_numbers : numpy.array
+                Numbers of the tiles, in the order drawn
         """
-        tile_list = []
-        for n in range(number):
-            tile_list.append(self.draw_tile())
-        return tile_list
+        if number > self.total:
+            raise IndexError("draw from empty tile bag")
+        drawn = self.rng.multivariate_hypergeometric(self.counts, number)
+        self.counts -= drawn
+        self.total -= number
+        return self.rng.permutation(np.repeat(self.tile_types, drawn))
 
     def return_tile(self, tile_number):
         """
-        Return a single tile to the bag and shuffle
+        Return a single tile to the bag
 
         Parameters
             tile_number : int
                 Number of tile drawn
         """
-        self.tile_numbers.append(tile_number)
-        self.mix()
+        self.counts[np.searchsorted(self.tile_types, tile_number)] += 1
+        self.total += 1
+
+    def return_tiles(self, tile_numbers):
+        """
+        Return a number of tiles to the bag
+
+        Parameters
+            tile_numbers : list
+                Numbers of tiles drawn
+        """
+        tile_numbers = np.asarray(tile_numbers, dtype=int).ravel()
+        self.counts += np.bincount(
+            np.searchsorted(self.tile_types, tile_numbers),
+            minlength=len(self.tile_types),
+        )
+        self.total += len(tile_numbers)
+
+    def __len__(self):
+        """Number of tiles left in the bag"""
+        return self.total
 
     def __repr__(self):
         """Display tile bag"""
@@ -240,6 +728,135 @@ class TileBag:
         return tile_list
 
 
+class TileSource:
+    """
+    Represents an endless source of tiles for the Shifting Maze game, which can be used
+    in place of a TileBag (e.g. for very large or chunked boards), as it never runs out.
+
+    Each tile is drawn with a chance in proportion to its count in the tile set,
+    using Walker's alias method: a column is chosen at random and then either the tile
+    for that column or its alias, so each draw takes the same time however many
+    different tiles there are.
+
+    Attributes
+        tile_types : numpy.array
+            Numbers of the different tiles in the set (in order)
+        chances : numpy.array
+            Chance of choosing the tile for each column rather than its alias
+        aliases : numpy.array
+            Index (into tile_types) of the alias for each column
+        rng : numpy.random.Generator
+            Random number generator used to draw tiles
+    """
+
+    def __init__(self, tile_set, rng=None):
+        """
+        Parameters
+            tile_set : TileSet
+                Set of tiles in play for a game of the Shifting Maze.
+
+        Keywords
+            rng : numpy.random.Generator
+                Random number generator used to draw tiles
+                (e.g. RandomStreams.get("tile_bag")). Default is None, a new generator
+        """
+        self.tile_types = np.array(sorted(tile_set.tile_counts), dtype=int)
+        counts = np.array(
+            [tile_set.tile_counts[tile_number] for tile_number in self.tile_types],
+            dtype=float,
+        )
+        columns = len(counts)
+        scaled = counts * columns / counts.sum()
+        self.chances = np.ones(columns)
+        self.aliases = np.arange(columns)
+
+        small = [column for column in range(columns) if scaled[column] < 1]
+        large = [column for column in range(columns) if scaled[column] >= 1]
+        while small and large:
+            small_column = small.pop()
+            large_column = large.pop()
+            self.chances[small_column] = scaled[small_column]
+            self.aliases[small_column] = large_column
+            scaled[large_column] -= 1 - scaled[small_column]
+            if scaled[large_column] < 1:
+                small.append(large_column)
+            else:
+                large.append(large_column)
+
+        self.rng = rng if rng is not None else np.random.default_rng()
+
+    def mix(self):
+        """Mix the content of the source. Nothing to do, as every draw is independent."""
+
+    def draw_tile(self):
+        """
+        Draw a single tile from the source
+
+        Parameters
+            none
+
+        Returns
+            tile_number : int
+                Number of tile drawn
+        """
+        return int(self.draw_tiles(1)[0])
+
+    def draw_tiles(self, number=1):
+        """
+        Draw a number tiles from the source
+
+        Parameters
+            number : int
+                Number of tiles to be drawn. Default = 1
+
+        Returns
+            tile_numbers : numpy.array
+                Numbers of the tiles, in the order drawn
+        """
+        columns = self.rng.integers(len(self.tile_types), size=number)
+        use_alias = self.rng.random(number) >= self.chances[columns]
+        columns[use_alias] = self.aliases[columns[use_alias]]
+        return self.tile_types[columns]
+
+    def return_tile(self, tile_number):
+        """
+        Return a single tile to the source. Nothing to do, as the source never runs out.
+
+        Parameters
+            tile_number : int
+                Number of tile drawn
+        """
+
+    def return_tiles(self, tile_numbers):
+        """
+        Return a number of tiles to the source. Nothing to do, as the source never runs out.
+
+        Parameters
+            tile_numbers : list
+                Numbers of tiles drawn
+        """
+
+    def __str__(self):
+        """Print tile source"""
+        string = ""
+        for tile_number, chance in zip(self.tile_types, self.get_chances()):
+            string += f" {tile_number}:{chance:.3f}"
+        return string
+
+    def get_chances(self):
+        """
+        Get the chance of drawing each tile
+
+        Returns
+            chances : numpy.array
+                Chance of drawing each tile in tile_types
+        """
+        columns = len(self.tile_types)
+        chances = self.chances / columns
+        np.add.at(chances, self.aliases, (1 - self.chances) / columns)
+        return chances
+
+
 #
 # Some tests in isolation
 #
@@ -310,6 +927,24 @@ if __name__ == "__main__":
     print()
     print(tile_bag.tile_numbers)
 
+    # tile atlas cache: a bad cache file is replaced, and a cache directory
+    # that cannot be written to is ignored
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        atlas = TileAtlas(tile_set.tiles, size=34, cache_dir=cache_dir)
+        with open(atlas.cache_path, "r+b") as cache_file:
+            cache_file.truncate(100)
+        bad_atlas = TileAtlas(tile_set.tiles, size=34, cache_dir=cache_dir)
+        assert pygame.image.tobytes(bad_atlas.image, "RGB") == pygame.image.tobytes(
+            atlas.image, "RGB"
+        )
+        assert os.path.getsize(atlas.cache_path) == 4 * 34 * 5 * 34 * 4
+        file_path = os.path.join(cache_dir, "file")
+        open(file_path, "w").close()
+        TileAtlas(tile_set.tiles, size=34, cache_dir=os.path.join(file_path, "cache"))
+    print("Tile atlas cache: bad file replaced, unwritable directory ignored")
+
     # wait for an exit
     while True:
         for event in pygame.event.get():